@@ -0,0 +1,199 @@
+"""
+重试、准入和调度的离线测试：不启动浏览器，面板由 weirdhost.mock_panel 模拟。
+
+运行：python -m pytest -q
+"""
+import time
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from weirdhost import fastpath, pool, preflight, scheduler, tracing
+from weirdhost.admission import Admission, CircuitBreaker, TokenBucket
+from weirdhost.mock_panel import MockPanel
+from weirdhost.retry import NetworkTimeout, PanelOverloaded, RateLimited, RenewFailure, RetryBudget
+
+NOW = datetime(2026, 10, 18, 12, 0, 0)
+
+
+@pytest.fixture
+def expire_file(tmp_path, monkeypatch):
+    path = tmp_path / "expire.txt"
+    monkeypatch.setattr(scheduler, "EXPIRE_FILE", str(path))
+    monkeypatch.setattr(scheduler, "WINDOW_HOURS", 24)
+    monkeypatch.setattr(scheduler, "MAX_SLEEP", 1800)
+    return path
+
+
+@pytest.fixture
+def fast_retry(monkeypatch):
+    monkeypatch.setenv("RETRY_BASE_DELAY", "0.01")
+    monkeypatch.setenv("RETRY_MAX_DELAY", "0.01")
+
+
+# ===================== 熔断器 =====================
+def test_breaker_opens_after_threshold():
+    breaker = CircuitBreaker(threshold=2, cooldown=0.05, max_cooldown=1)
+    breaker.failure("HTTP 503")
+    assert breaker.state == "closed" and breaker.check() == 0
+    breaker.failure("HTTP 503")
+    assert breaker.state == "open" and breaker.trips == 1
+    assert breaker.check() > 0
+
+
+def test_breaker_half_open_lets_one_probe_through():
+    breaker = CircuitBreaker(threshold=1, cooldown=0.05, max_cooldown=1)
+    breaker.failure("HTTP 503")
+    time.sleep(0.06)
+    assert breaker.check() == 0
+    assert breaker.state == "half_open"
+    # 试探还没有结果，其余任务继续等待
+    assert breaker.check() > 0
+
+
+def test_breaker_failed_probe_reopens_with_longer_cooldown():
+    breaker = CircuitBreaker(threshold=1, cooldown=0.05, max_cooldown=1)
+    breaker.failure("HTTP 503")
+    time.sleep(0.06)
+    breaker.check()
+    breaker.failure("HTTP 503")
+    assert breaker.state == "open" and breaker.trips == 2
+    assert breaker.check() > 0.05
+
+
+def test_breaker_successful_probe_closes():
+    breaker = CircuitBreaker(threshold=1, cooldown=0.05, max_cooldown=1)
+    breaker.failure("HTTP 503")
+    time.sleep(0.06)
+    breaker.check()
+    breaker.success()
+    assert breaker.state == "closed" and breaker.failures == 0
+    assert breaker.cooldown == breaker.base_cooldown
+    assert breaker.check() == 0
+
+
+# ===================== 令牌桶 =====================
+def test_bucket_waits_when_empty():
+    bucket = TokenBucket(rate=50, burst=1)
+    assert asyncio.run(bucket.acquire()) == 0
+    assert asyncio.run(bucket.acquire()) > 0
+
+
+def test_bucket_disabled_with_zero_rate():
+    bucket = TokenBucket(rate=0, burst=1)
+    assert [asyncio.run(bucket.acquire()) for _ in range(3)] == [0, 0, 0]
+
+
+# ===================== 重试预算 =====================
+def _flaky(errors, value="ok"):
+    """依次抛出 errors 中的异常，之后返回 value；calls 记录调用次数"""
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return value
+
+    return fn, calls
+
+
+def test_budget_retries_retryable_failures(fast_retry):
+    budget = RetryBudget("t", budget=10, attempts=3)
+    fn, calls = _flaky([NetworkTimeout("slow"), NetworkTimeout("slow")])
+    assert asyncio.run(budget.run("navigation", fn)) == "ok"
+    assert len(calls) == 3
+    assert [h["kind"] for h in budget.history] == ["timeout", "timeout"]
+
+
+def test_budget_does_not_retry_limited(fast_retry):
+    budget = RetryBudget("t", budget=10, attempts=3)
+    fn, calls = _flaky([RateLimited("once at one time period")])
+    with pytest.raises(RateLimited):
+        asyncio.run(budget.run("verification", fn))
+    assert len(calls) == 1 and budget.history == []
+
+
+def test_budget_does_not_retry_unknown(fast_retry):
+    budget = RetryBudget("t", budget=10, attempts=3)
+    fn, calls = _flaky([ValueError("boom")])
+    with pytest.raises(RenewFailure) as exc:
+        asyncio.run(budget.run("click", fn))
+    assert exc.value.kind == "unknown" and exc.value.phase == "click"
+    assert len(calls) == 1
+
+
+def test_budget_gives_up_after_attempts(fast_retry):
+    budget = RetryBudget("t", budget=10, attempts=2)
+    fn, calls = _flaky([NetworkTimeout("slow")] * 5)
+    with pytest.raises(NetworkTimeout):
+        asyncio.run(budget.run("navigation", fn))
+    assert len(calls) == 2
+
+
+def test_budget_stops_when_budget_runs_out(monkeypatch):
+    monkeypatch.setenv("RETRY_BASE_DELAY", "1")
+    monkeypatch.setenv("RETRY_MAX_DELAY", "1")
+    # 下一次退避至少 0.5s，超过剩余预算，不再等待
+    budget = RetryBudget("t", budget=0.2, attempts=5)
+    fn, calls = _flaky([NetworkTimeout("slow")] * 5)
+    with pytest.raises(NetworkTimeout):
+        asyncio.run(budget.run("navigation", fn))
+    assert len(calls) == 1 and budget.history == []
+
+
+def test_budget_overloads_while_breaker_open(fast_retry):
+    gate = Admission(rate=0, burst=1)
+    gate.breaker.failures = gate.breaker.threshold - 1
+    gate.breaker.failure("HTTP 503")
+    fn, calls = _flaky([])
+    with pytest.raises(PanelOverloaded):
+        asyncio.run(RetryBudget("t", budget=0.5, gate=gate).run("navigation", fn))
+    assert calls == []
+
+
+# ===================== 调度 =====================
+def test_decide_runs_without_record(expire_file):
+    assert scheduler.decide("e66c2244", NOW) == ("run", 0, None)
+
+
+def test_decide_runs_when_window_open(expire_file):
+    scheduler.record_expiry("e66c2244", NOW + timedelta(hours=3))
+    action, _, opens_at = scheduler.decide("e66c2244", NOW)
+    assert action == "run" and opens_at == NOW - timedelta(hours=21)
+
+
+def test_decide_sleeps_when_window_opens_soon(expire_file):
+    scheduler.record_expiry("e66c2244", NOW + timedelta(hours=24, minutes=10))
+    action, seconds, _ = scheduler.decide("e66c2244", NOW)
+    assert action == "sleep" and seconds == 600
+
+
+def test_decide_skips_when_window_far(expire_file):
+    scheduler.record_expiry("e66c2244", NOW + timedelta(days=2))
+    assert scheduler.decide("e66c2244", NOW)[0] == "skip"
+    assert scheduler.due_servers(["e66c2244", "abcd1234"], NOW) == ["abcd1234"]
+
+
+# ===================== 预检 =====================
+def test_probe_defers_on_outage(monkeypatch):
+    panel = MockPanel(outage=True)
+    panel.start()
+    try:
+        monkeypatch.setattr(fastpath, "SERVER_API", panel.base_url + "/api/client/servers/{server_id}")
+        check = preflight.probe(fastpath.build_session("mock-cookie"), "e66c2244", NOW, timeout=5)
+    finally:
+        panel.stop()
+    assert check["decision"] == "defer"
+    assert check["http"] == 503 and check["expire"] is None
+
+
+# ===================== 进程池 =====================
+def test_pool_without_due_servers_exits_cleanly(expire_file, tmp_path, monkeypatch):
+    scheduler.record_expiry("e66c2244", datetime(2099, 1, 1))
+    monkeypatch.setenv("SERVER_IDS", "e66c2244")
+    monkeypatch.setenv("FLEET_ONLY_DUE", "1")
+    monkeypatch.setattr(tracing, "REPORT_DIR", str(tmp_path / "reports"))
+    assert pool.main([]) is True
+    assert len(list((tmp_path / "reports").glob("pool-*.json"))) == 1
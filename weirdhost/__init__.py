@@ -0,0 +1 @@
+"""weirdhost 自动续期工具包"""
@@ -0,0 +1,180 @@
+"""
+面板准入控制：所有续期阶段在访问 hub.weirdhost.xyz 之前先经过这里。
+  - 令牌桶：每个阶段的每次尝试（登录、打开页面、点击续期、复查）消耗一个令牌，
+    限制整个进程对面板的请求速率；多进程运行时由 pool 按进程数平分
+  - 熔断器：面板连续返回 429/5xx 或阶段连续超时 PANEL_BREAKER_THRESHOLD 次后打开，
+    打开期间排队的任务原地退避（带抖动），冷却结束后只放一个任务试探：
+    试探成功则关闭，失败则冷却时间翻倍重新打开。等待超出该服务器的重试预算时以 overload 失败结束，
+    而不是让所有任务一起等满 60 秒超时。
+
+环境变量：
+  PANEL_RATE                    每秒令牌数，默认 2，设为 0 关闭限速
+  PANEL_BURST                   令牌桶容量，默认 4
+  PANEL_BREAKER_THRESHOLD       连续失败多少次后熔断，默认 5
+  PANEL_BREAKER_COOLDOWN        首次熔断冷却（秒），默认 15
+  PANEL_BREAKER_MAX_COOLDOWN    冷却上限（秒），默认 120
+"""
+import os
+import time
+import random
+import asyncio
+import threading
+from urllib.parse import urlparse
+
+from weirdhost.common import BASE_URL
+from weirdhost.retry import PanelOverloaded
+
+PANEL_HOST = urlparse(BASE_URL).hostname
+# 只有这些请求代表面板本身的健康状况，静态资源和第三方脚本不算
+WATCHED_TYPES = ("document", "xhr", "fetch")
+
+
+# ===================== 令牌桶 =====================
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        """取一个令牌，返回等待的秒数"""
+        if self.rate <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return waited
+            delay = (1 - self.tokens) / self.rate
+            waited += delay
+            await asyncio.sleep(delay)
+
+
+# ===================== 熔断器 =====================
+class CircuitBreaker:
+    def __init__(self, threshold, cooldown, max_cooldown):
+        self.threshold = threshold
+        self.base_cooldown = cooldown
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.state = "closed"
+        self.failures = 0
+        self.opened_until = 0.0
+        self.probe_started = None
+        self.trips = 0
+
+    def check(self):
+        """返回需要再等待的秒数，0 表示放行"""
+        now = time.monotonic()
+        if self.state == "open":
+            if now < self.opened_until:
+                return self.opened_until - now
+            self.state = "half_open"
+            self.probe_started = None
+        if self.state == "half_open":
+            # 只放一个任务试探；试探迟迟没有结果时再放下一个
+            if self.probe_started is not None and now - self.probe_started < self.base_cooldown:
+                return 0.5
+            self.probe_started = now
+        return 0.0
+
+    def success(self):
+        if self.state != "closed":
+            print("🟢 面板恢复，熔断器关闭")
+        self.state = "closed"
+        self.failures = 0
+        self.cooldown = self.base_cooldown
+
+    def failure(self, reason):
+        self.failures += 1
+        if self.state == "open":
+            return
+        if self.state == "half_open" or self.failures >= self.threshold:
+            self.state = "open"
+            self.trips += 1
+            self.opened_until = time.monotonic() + self.cooldown
+            print(f"🔴 熔断器打开（{reason}，连续 {self.failures} 次），{self.cooldown:.0f}s 内暂停访问面板")
+            self.cooldown = min(self.max_cooldown, self.cooldown * 2)
+
+
+# ===================== 准入 =====================
+class Admission:
+    def __init__(self, rate=None, burst=None):
+        self.bucket = TokenBucket(
+            float(rate if rate is not None else os.getenv("PANEL_RATE") or "2"),
+            float(burst if burst is not None else os.getenv("PANEL_BURST") or "4"),
+        )
+        self.breaker = CircuitBreaker(
+            int(os.getenv("PANEL_BREAKER_THRESHOLD") or "5"),
+            float(os.getenv("PANEL_BREAKER_COOLDOWN") or "15"),
+            float(os.getenv("PANEL_BREAKER_MAX_COOLDOWN") or "120"),
+        )
+        self.admitted = 0
+        self.throttled = 0.0
+        self.backoff = 0.0
+
+    def share(self, workers):
+        """多进程运行时每个进程只拿总速率的 1/workers"""
+        if workers > 1:
+            self.bucket.rate /= workers
+            self.bucket.burst = max(1.0, self.bucket.burst / workers)
+            self.bucket.tokens = min(self.bucket.tokens, self.bucket.burst)
+
+    async def admit(self, deadline=None):
+        """熔断器打开时退避等待，然后取令牌；等待会超过 deadline 时抛出 PanelOverloaded"""
+        while True:
+            delay = self.breaker.check()
+            if delay <= 0:
+                break
+            # 抖动，避免冷却结束时所有排队任务同时涌向面板
+            delay *= random.uniform(1.0, 1.5)
+            if deadline is not None and time.monotonic() + delay > deadline:
+                raise PanelOverloaded("面板熔断中，等待超出重试预算")
+            self.backoff += delay
+            await asyncio.sleep(delay)
+        self.throttled += await self.bucket.acquire()
+        self.admitted += 1
+
+    def observe(self, failure):
+        """阶段失败：超时计入熔断器"""
+        if failure.kind == "timeout":
+            self.breaker.failure("阶段超时")
+
+    def observe_response(self, response):
+        """context 的 response 事件：面板页面和接口的状态码计入熔断器"""
+        if response.request.resource_type not in WATCHED_TYPES or urlparse(response.url).hostname != PANEL_HOST:
+            return
+        if response.status == 429 or response.status >= 500:
+            self.breaker.failure(f"HTTP {response.status}")
+        elif response.status < 400:
+            self.breaker.success()
+
+    def stats(self):
+        return {
+            "rate": self.bucket.rate,
+            "burst": self.bucket.burst,
+            "admitted": self.admitted,
+            "throttled_seconds": round(self.throttled, 2),
+            "backoff_seconds": round(self.backoff, 2),
+            "breaker_state": self.breaker.state,
+            "breaker_trips": self.breaker.trips,
+        }
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_admission():
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = Admission()
+        return _default
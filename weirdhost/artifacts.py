@@ -0,0 +1,105 @@
+"""
+调试产物管理：截图以 JPEG 编码放入内存环形缓冲区，同时记录控制台和网络日志；
+只有续期失败或结果不在预期内时，才把缓冲区截图、HTML 快照和日志打包成一个 zip 写盘，
+并受大小上限约束（超出时先丢弃最旧的截图，再截断 HTML）。
+
+环境变量：
+  ARTIFACT_DIR        输出目录，默认 reports/artifacts
+  ARTIFACT_QUALITY    JPEG 质量，默认 60（Playwright 截图只支持 PNG/JPEG）
+  ARTIFACT_FRAMES     环形缓冲区保留的截图数，默认 5
+  ARTIFACT_MAX_KB     单个压缩包大小上限，默认 2048
+  ARTIFACT_EXPECTED   视为正常的结果，默认 renewed,limited，其余结果都会落盘
+"""
+import io
+import os
+import json
+import time
+import zipfile
+from collections import deque
+from datetime import datetime
+
+from weirdhost.tracing import REPORT_DIR
+
+ARTIFACT_DIR = os.getenv("ARTIFACT_DIR", os.path.join(REPORT_DIR, "artifacts"))
+QUALITY = int(os.getenv("ARTIFACT_QUALITY") or "60")
+MAX_FRAMES = int(os.getenv("ARTIFACT_FRAMES") or "5")
+MAX_BYTES = int(os.getenv("ARTIFACT_MAX_KB") or "2048") * 1024
+EXPECTED = {s.strip() for s in os.getenv("ARTIFACT_EXPECTED", "renewed,limited").split(",") if s.strip()}
+LOG_LINES = 300
+
+
+def expected(status):
+    return status in EXPECTED
+
+
+class ArtifactRecorder:
+    def __init__(self, page, label):
+        self.page = page
+        self.label = label
+        self.t0 = time.monotonic()
+        self.frames = deque(maxlen=MAX_FRAMES)
+        self.console = deque(maxlen=LOG_LINES)
+        self.network = deque(maxlen=LOG_LINES)
+        page.on("console", lambda msg: self._log(self.console, f"[{msg.type}] {msg.text}"))
+        page.on("pageerror", lambda err: self._log(self.console, f"[pageerror] {err}"))
+        page.on("response", lambda resp: self._log(self.network, f"{resp.status} {resp.request.method} {resp.url}"))
+        page.on("requestfailed", lambda req: self._log(self.network, f"FAILED {req.method} {req.url} {req.failure}"))
+
+    def _log(self, buffer, line):
+        buffer.append(f"{time.monotonic() - self.t0:8.3f} {line}")
+
+    async def snap(self, step):
+        """截图进入环形缓冲区，不写盘"""
+        try:
+            data = await self.page.screenshot(type="jpeg", quality=QUALITY)
+        except Exception as e:
+            self._log(self.console, f"[artifact] 截图失败 {step}: {e}")
+            return
+        self.frames.append((step, time.monotonic() - self.t0, data))
+
+    async def persist(self, reason):
+        """打包缓冲区、HTML 快照和日志，返回写出的 zip 路径"""
+        try:
+            html = await self.page.content()
+        except Exception as e:
+            html = f"<!-- 无法获取页面内容: {e} -->"
+        meta = {
+            "label": self.label,
+            "reason": reason,
+            "url": self.page.url,
+            "at": datetime.now().isoformat(timespec="seconds"),
+        }
+        frames = list(self.frames)
+        data = self._bundle(meta, html, frames)
+        # 超出上限：先丢最旧的截图，再截断 HTML
+        while len(data) > MAX_BYTES and frames:
+            frames.pop(0)
+            data = self._bundle(meta, html, frames)
+        while len(data) > MAX_BYTES and len(html) > 1024:
+            html = html[: len(html) // 2] + "\n<!-- truncated -->"
+            data = self._bundle(meta, html, frames)
+
+        os.makedirs(ARTIFACT_DIR, exist_ok=True)
+        path = os.path.join(ARTIFACT_DIR, f"{self.label}-{datetime.now():%Y%m%d-%H%M%S}.zip")
+        with open(path, "wb") as f:
+            f.write(data)
+        print(f"📦 调试产物已保存 {path}（{len(data) / 1024:.0f} KB，{len(frames)} 张截图）")
+        return path
+
+    def _bundle(self, meta, html, frames):
+        # meta 里的截图列表按实际打包的截图生成，丢弃过的截图不会出现在 meta.json 中
+        meta = {
+            **meta,
+            "frames": [{"step": step, "at": round(at, 3), "bytes": len(data)} for step, at, data in frames],
+            "dropped_frames": len(self.frames) - len(frames),
+        }
+        buf = io.BytesIO()
+        with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as z:
+            z.writestr("meta.json", json.dumps(meta, ensure_ascii=False, indent=2))
+            z.writestr("page.html", html)
+            z.writestr("console.log", "\n".join(self.console))
+            z.writestr("network.log", "\n".join(self.network))
+            for i, (step, _, data) in enumerate(frames):
+                # JPEG 已经压缩过，直接存储
+                z.writestr(f"{i:02d}-{step}.jpg", data, compress_type=zipfile.ZIP_STORED)
+        return buf.getvalue()
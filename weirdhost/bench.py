@@ -0,0 +1,164 @@
+"""
+端到端基准测试：启动本地模拟面板，依次以子进程运行各脚本，
+统计每个变体的 p50/p95 运行时间、启动耗时（进程启动到首次访问面板）、浏览器进程树峰值内存和成功率。
+
+用法：
+  python -m weirdhost.bench --runs 5 --latency 0.1 --challenge
+  python -m weirdhost.bench --variants main.py,test.py,fastpath
+  python -m weirdhost.bench --variant="--preset main --wait fixed" --variant="--preset main --wait event"
+以 "-" 开头的变体作为 weirdhost.core 的命令行参数，用于对比不同策略组合。
+"""
+import os
+import sys
+import json
+import shlex
+import time
+import argparse
+import tempfile
+import threading
+import subprocess
+from datetime import datetime
+
+from weirdhost.common import percentile
+from weirdhost.mock_panel import MOCK_COOKIE, MOCK_PASSWORD, MOCK_USER, MockPanel
+from weirdhost.procstat import tree_rss
+
+DEFAULT_VARIANTS = "main.py,main1.py,test.py,fastpath"
+RUN_TIMEOUT = 180
+
+
+# ===================== 内存采样 =====================
+class PeakSampler(threading.Thread):
+    def __init__(self, pid, interval=0.2):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.peak = None
+        self.done = threading.Event()
+
+    def run(self):
+        while not self.done.is_set():
+            rss = tree_rss(self.pid)
+            if rss is not None:
+                self.peak = max(self.peak or 0, rss)
+            self.done.wait(self.interval)
+
+
+# ===================== 运行 =====================
+def variant_command(variant):
+    if variant.startswith("-"):
+        return [sys.executable, "-m", "weirdhost.core", *shlex.split(variant)]
+    if variant.endswith(".py"):
+        return [sys.executable, variant]
+    return [sys.executable, "-m", f"weirdhost.{variant}"]
+
+
+def run_once(variant, panel, workdir, preflight=False):
+    env = {
+        **os.environ,
+        "WEIRDHOST_BASE_URL": panel.base_url,
+        "REMEMBER_WEB_COOKIE": MOCK_COOKIE,
+        "PTERODACTYL_EMAIL": MOCK_USER,
+        "PTERODACTYL_PASSWORD": MOCK_PASSWORD,
+        "SESSION_STORE_DIR": os.path.join(workdir, ".session"),
+        "RUN_REPORT_DIR": os.path.join(workdir, "reports"),
+        "EXPIRE_FILE": os.path.join(workdir, "expire.txt"),
+        "HISTORY_FILE": os.path.join(workdir, ".history", "runs.jsonl"),
+        # 模拟面板的到期时间离窗口很远，预检会直接跳过浏览器；默认关闭以测量完整流程
+        "PREFLIGHT": "1" if preflight else "0",
+    }
+    for key in ("TELEGRAM_BOT_TOKEN", "TELEGRAM_CHAT_ID"):
+        env.pop(key, None)
+
+    start = time.monotonic()
+    proc = subprocess.Popen(
+        variant_command(variant), env=env, cwd=os.getcwd(),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    sampler = PeakSampler(proc.pid)
+    sampler.start()
+    try:
+        code = proc.wait(timeout=RUN_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        code = None
+    sampler.done.set()
+    sampler.join()
+    return {
+        "seconds": time.monotonic() - start,
+        "startup": panel.first_request - start if panel.first_request else None,
+        "ok": code == 0,
+        "peak_rss": sampler.peak,
+    }
+
+
+def summarize(variant, runs):
+    seconds = [r["seconds"] for r in runs]
+    startup = [r["startup"] for r in runs if r["startup"] is not None]
+    rss = [r["peak_rss"] for r in runs if r["peak_rss"]]
+    return {
+        "variant": variant,
+        "runs": len(runs),
+        "success_rate": sum(r["ok"] for r in runs) / len(runs),
+        "p50": percentile(seconds, 0.5),
+        "p95": percentile(seconds, 0.95),
+        "startup_p50": percentile(startup, 0.5),
+        "peak_rss_mb": max(rss) / 2 ** 20 if rss else None,
+    }
+
+
+def format_table(rows):
+    width = max([12] + [len(r["variant"]) + 2 for r in rows])
+    lines = [f"{'variant':<{width}}{'runs':>6}{'success':>8}{'p50(s)':>9}{'p95(s)':>9}{'start(s)':>10}{'rss(MB)':>10}"]
+    for r in rows:
+        mem = f"{r['peak_rss_mb']:.0f}" if r["peak_rss_mb"] else "-"
+        startup = f"{r['startup_p50']:.2f}" if r["startup_p50"] is not None else "-"
+        lines.append(
+            f"{r['variant']:<{width}}{r['runs']:>6}{r['success_rate']:>8.0%}{r['p50']:>9.2f}{r['p95']:>9.2f}{startup:>10}{mem:>10}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="对本地模拟面板运行续期脚本基准测试")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--variants", default=DEFAULT_VARIANTS, help="逗号分隔：脚本文件或 weirdhost 子模块名")
+    parser.add_argument("--variant", action="append", default=[], help="weirdhost.core 策略参数，可重复")
+    parser.add_argument("--latency", type=float, default=0.0, help="模拟面板每个请求的延迟（秒）")
+    parser.add_argument("--challenge", action="store_true", help="启用假 Turnstile")
+    parser.add_argument("--limited", action="store_true", help="模拟本周期已续期")
+    parser.add_argument("--outage", action="store_true", help="模拟面板返回 503")
+    parser.add_argument("--preflight", action="store_true", help="保留 HTTP 预检（默认关闭，测量完整浏览器流程）")
+    args = parser.parse_args()
+
+    panel = MockPanel(latency=args.latency, challenge=args.challenge, limited=args.limited, outage=args.outage)
+    base_url = panel.start()
+    print(f"🧪 模拟面板: {base_url}")
+
+    rows = []
+    try:
+        variants = [v.strip() for v in args.variants.split(",") if v.strip()] if not args.variant else []
+        for variant in variants + args.variant:
+            runs = []
+            for i in range(args.runs):
+                panel.reset()
+                with tempfile.TemporaryDirectory() as workdir:
+                    result = run_once(variant, panel, workdir, args.preflight)
+                runs.append(result)
+                startup = f"，启动 {result['startup']:.2f}s" if result["startup"] is not None else ""
+                print(f"  {variant} #{i + 1}: {'✅' if result['ok'] else '❌'} {result['seconds']:.2f}s{startup}")
+            rows.append(summarize(variant, runs))
+    finally:
+        panel.stop()
+
+    print(format_table(rows))
+    os.makedirs("reports", exist_ok=True)
+    path = os.path.join("reports", f"bench-{datetime.now():%Y%m%d-%H%M%S}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"latency": args.latency, "challenge": args.challenge, "results": rows}, f, ensure_ascii=False, indent=2)
+    print(f"📝 基准结果已写入 {path}")
+    return all(r["success_rate"] == 1 for r in rows)
+
+
+if __name__ == "__main__":
+    exit(0 if main() else 1)
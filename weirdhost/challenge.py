@@ -0,0 +1,165 @@
+"""
+Cloudflare Turnstile 处理：识别验证组件，按顺序尝试各点击策略，
+每个策略之后等待 cf-turnstile-response 拿到 token（或验证框消失），一拿到立即继续，
+不再固定 sleep 最坏情况的时长。每次尝试的耗时和结果追加到 CHALLENGE_STATS_FILE
+（默认 .history/challenge-stats.jsonl，与运行历史一起由 actions/cache 保留），
+可用 `python -m weirdhost.challenge` 查看各策略的成功率和解题耗时。
+
+策略：
+  none        不点击，只等自动通过（Turnstile 多数情况下会自动放行）
+  frame       frame_locator 强制点击 iframe 内的 #challenge-stage（原 main.py）
+  checkbox    点击 iframe 内的复选框 input
+  coordinate  按 iframe 坐标模拟鼠标轨迹物理点击（原 test1.py）
+"""
+import os
+import sys
+import json
+import time
+from datetime import datetime
+
+from weirdhost.common import percentile
+from weirdhost.history import HISTORY_FILE
+from weirdhost.waits import CHALLENGE_SELECTOR, async_wait_for_challenge_solved
+
+STATS_FILE = os.getenv("CHALLENGE_STATS_FILE", os.path.join(os.path.dirname(HISTORY_FILE) or ".", "challenge-stats.jsonl"))
+
+DETECT_SCRIPT = """
+() => {
+    const token = document.querySelector('input[name="cf-turnstile-response"]');
+    const widget = document.querySelector('%s') || document.querySelector('.cf-turnstile') || token;
+    return {present: !!widget, token: !!(token && token.value)};
+}
+""" % CHALLENGE_SELECTOR
+
+
+# ===================== 点击策略 =====================
+async def click_none(page):
+    pass
+
+
+async def click_frame(page):
+    await page.frame_locator(CHALLENGE_SELECTOR).locator("#challenge-stage").click(force=True, timeout=5000)
+
+
+async def click_checkbox(page):
+    await page.frame_locator(CHALLENGE_SELECTOR).locator('input[type="checkbox"]').first.click(timeout=5000)
+
+
+async def click_coordinate(page):
+    frame = await page.query_selector(CHALLENGE_SELECTOR)
+    box = await frame.bounding_box() if frame else None
+    if not box:
+        raise RuntimeError("未找到验证框位置")
+    # 复选框大致位于 iframe 内部靠左约 40 像素、垂直居中，模拟真人鼠标轨迹后物理点击
+    x, y = box["x"] + 45, box["y"] + box["height"] / 2
+    await page.mouse.move(x - 20, y - 20)
+    await page.mouse.move(x, y, steps=5)
+    await page.mouse.click(x, y)
+
+
+STRATEGIES = {"none": click_none, "frame": click_frame, "checkbox": click_checkbox, "coordinate": click_coordinate}
+
+
+# ===================== 解题 =====================
+async def detect(page):
+    return await page.evaluate(DETECT_SCRIPT)
+
+
+async def solve(page, order, timeout=20000, fixed=False):
+    """
+    依次尝试 order 中的策略，剩余时间在未尝试的策略间平分。
+    fixed=True 时不监听 token，每个策略固定等待分到的时长后检查一次（作为对照组）。
+    返回 {"solved", "strategy", "seconds", "attempts": [...]}
+    """
+    start = time.monotonic()
+    deadline = start + timeout / 1000
+    state = await detect(page)
+    if state["token"] or not state["present"]:
+        return {"solved": True, "strategy": "auto", "seconds": 0.0, "attempts": []}
+
+    attempts = []
+    for i, name in enumerate(order):
+        # Playwright 中 timeout=0 表示不限时，至少给 1ms
+        slice_ms = max(1, (deadline - time.monotonic()) * 1000 / (len(order) - i))
+        t0 = time.monotonic()
+        error = None
+        try:
+            await STRATEGIES[name](page)
+        except Exception as e:
+            error = str(e).split("\n", 1)[0]
+        if fixed:
+            await page.wait_for_timeout(slice_ms)
+            state = await detect(page)
+            solved = state["token"] or not state["present"]
+        else:
+            solved = await async_wait_for_challenge_solved(page, timeout=slice_ms) is not None
+        attempts.append({
+            "strategy": name,
+            "solved": solved,
+            "seconds": round(time.monotonic() - t0, 3),
+            "error": error,
+        })
+        print(f"🧩 验证策略 {name}: {'通过' if solved else '未通过'}（{attempts[-1]['seconds']:.1f}s）")
+        if solved:
+            break
+    record(attempts)
+    return {
+        "solved": bool(attempts) and attempts[-1]["solved"],
+        "strategy": attempts[-1]["strategy"] if attempts and attempts[-1]["solved"] else None,
+        "seconds": round(time.monotonic() - start, 3),
+        "attempts": attempts,
+    }
+
+
+# ===================== 统计 =====================
+def record(attempts):
+    if not attempts:
+        return
+    os.makedirs(os.path.dirname(STATS_FILE) or ".", exist_ok=True)
+    at = datetime.now().isoformat(timespec="seconds")
+    # 每行一条，追加写入，多进程并发时也不会互相覆盖
+    with open(STATS_FILE, "a", encoding="utf-8") as f:
+        for a in attempts:
+            f.write(json.dumps({"at": at, **a}, ensure_ascii=False) + "\n")
+
+
+def summarize(path=None):
+    rows = {}
+    path = path or STATS_FILE
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                a = json.loads(line)
+            except ValueError:
+                continue
+            rows.setdefault(a["strategy"], []).append(a)
+    summary = []
+    for name, items in sorted(rows.items()):
+        solved = [a["seconds"] for a in items if a["solved"]]
+        summary.append({
+            "strategy": name,
+            "attempts": len(items),
+            "success_rate": len(solved) / len(items),
+            "p50": percentile(solved, 0.5),
+            "p95": percentile(solved, 0.95),
+        })
+    return summary
+
+
+def main(argv):
+    rows = summarize(argv[0] if argv else None)
+    if not rows:
+        print(f"ℹ️ 暂无验证记录（{STATS_FILE}）")
+        return True
+    print(f"{'strategy':<12}{'attempts':>10}{'success':>9}{'p50(s)':>9}{'p95(s)':>9}")
+    for r in rows:
+        p50 = f"{r['p50']:.2f}" if r["p50"] is not None else "-"
+        p95 = f"{r['p95']:.2f}" if r["p95"] is not None else "-"
+        print(f"{r['strategy']:<12}{r['attempts']:>10}{r['success_rate']:>9.0%}{p50:>9}{p95:>9}")
+    return True
+
+
+if __name__ == "__main__":
+    exit(0 if main(sys.argv[1:]) else 1)
@@ -0,0 +1,116 @@
+import os
+import re
+import math
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+BASE_URL = os.getenv("WEIRDHOST_BASE_URL", "https://hub.weirdhost.xyz").rstrip("/")
+LOGIN_URL = f"{BASE_URL}/auth/login"
+DEFAULT_SERVER_ID = os.getenv("SERVER_ID", "e66c2244")
+REMEMBER_COOKIE_NAME = "remember_web_59ba36addc2b2f9401580f014c7f58ea4e30989d"
+PANEL_TZ = ZoneInfo("Asia/Seoul")
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# 与 main.py 相同的抗爬虫伪装脚本
+STEALTH_SCRIPT = """
+    Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
+    window.chrome = {runtime: {}};
+    Object.defineProperty(navigator, 'languages', {get: () => ['ko-KR', 'ko', 'en-US', 'en']});
+"""
+
+EXPIRE_RE = re.compile(r"(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})")
+
+# 本周期已续期过的提示文本
+LIMITED_MARKERS = ("once at one time period", "이미 연장")
+
+
+def server_url(server_id: str) -> str:
+    return f"{BASE_URL}/server/{server_id}"
+
+
+def cookie_domain() -> str:
+    return BASE_URL.split("://", 1)[-1].split("/", 1)[0].split(":", 1)[0]
+
+
+def remember_cookie(value: str) -> dict:
+    return {
+        "name": REMEMBER_COOKIE_NAME,
+        "value": value,
+        "domain": cookie_domain(),
+        "path": "/",
+        "httpOnly": True,
+        "secure": True,
+        "sameSite": "Lax",
+    }
+
+
+def context_options() -> dict:
+    return {
+        "user_agent": USER_AGENT,
+        "viewport": {"width": 1280, "height": 800},
+        "locale": "ko-KR",
+        "timezone_id": "Asia/Seoul",
+    }
+
+
+def parse_expire(text):
+    """
+    从文本中解析：
+    유통기한 2026-01-10 13:25:54
+    返回 datetime 对象，失败返回 None
+    """
+    m = EXPIRE_RE.search(text or "")
+    return datetime.strptime(m.group(1), "%Y-%m-%d %H:%M:%S") if m else None
+
+
+def panel_now():
+    """面板时区的当前时间（naive），与页面上的 유통기한 直接比较；runner 的时钟是 UTC"""
+    return datetime.now(PANEL_TZ).replace(tzinfo=None)
+
+
+def _to_panel_time(value):
+    if not isinstance(value, str):
+        return None
+    dt = parse_expire(value)
+    if dt:
+        return dt
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    # 与页面显示保持一致：统一换算为面板时区的 naive datetime
+    return dt.astimezone(PANEL_TZ).replace(tzinfo=None) if dt.tzinfo else dt
+
+
+def find_expire(data):
+    """在服务器详情 JSON 中查找到期时间字段（字段名包含 expir / 유통기한）"""
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if ("expir" in key.lower() or "유통기한" in key) and _to_panel_time(value):
+                return _to_panel_time(value)
+        for value in data.values():
+            found = find_expire(value)
+            if found:
+                return found
+    elif isinstance(data, list):
+        for value in data:
+            found = find_expire(value)
+            if found:
+                return found
+    return None
+
+
+def percentile(values, q):
+    """最近秩法分位数，values 为空时返回 None"""
+    if not values:
+        return None
+    values = sorted(values)
+    return values[max(0, math.ceil(q * len(values)) - 1)]
+
+
+def send_telegram(message: str):
+    """放入后台队列后立即返回，进程退出前自动发送完毕（见 weirdhost.notifier）"""
+    from weirdhost.notifier import default_notifier
+
+    default_notifier().send(message)
@@ -0,0 +1,514 @@
+"""
+统一续期核心：登录、等待、验证挑战、结果校验四个环节都是可替换的策略，
+main.py / main1.py / test.py / test1.py 只是不同组合的预设。
+
+策略：
+  --login      storage（缓存会话）/ cookie / password，按顺序尝试，可组合
+  --wait       event（等待具体信号）/ fixed（固定等待后检查一次）
+  --challenge  none / frame / checkbox / coordinate，按顺序尝试直到拿到 token（见 weirdhost/challenge.py）
+  --verify     expiry（到期时间增加）/ banner（频率限制提示）/ reload（刷新后复查），按顺序判定
+
+用法：
+  python -m weirdhost.core --preset test
+  python -m weirdhost.core --login cookie,password --wait fixed --challenge coordinate --verify reload,banner
+每次运行的策略组合写入 reports/ 下的运行报告，配合 weirdhost.bench 做 A/B 对比。
+启动浏览器前先做一次 HTTP 预检（见 weirdhost/preflight.py），窗口未到或面板故障时不启动 Chromium，
+--no-preflight 关闭预检。
+"""
+import os
+import time
+import asyncio
+import argparse
+import traceback
+from dataclasses import asdict, dataclass, replace
+
+from weirdhost.admission import default_admission
+from weirdhost.artifacts import ArtifactRecorder, expected
+from weirdhost.challenge import STRATEGIES as CHALLENGE_STRATEGIES, solve
+from weirdhost.common import (
+    DEFAULT_SERVER_ID, LIMITED_MARKERS, LOGIN_URL, STEALTH_SCRIPT,
+    context_options, remember_cookie, server_url,
+)
+from weirdhost.expiry import ExpiryReader
+from weirdhost.history import record as record_history, record_account
+from weirdhost.network import READY_SELECTOR, RequestBlocker, async_goto_ready
+from weirdhost.notifier import default_notifier
+from weirdhost.preflight import ENABLED as PREFLIGHT_ENABLED, preflight
+from weirdhost.retry import (
+    ChallengeFailed, LoginRedirect, NetworkTimeout, ParseFailure, RateLimited, RetryBudget, classify,
+)
+from weirdhost.scheduler import record_expiry
+from weirdhost.session_store import SessionStore, credential_secret
+from weirdhost.tracing import PhaseTimer, RunTrace
+from weirdhost.waits import RESPONSE_HOOK_SCRIPT, async_wait_for_outcome
+
+
+@dataclass
+class Strategy:
+    login: tuple = ("storage", "cookie", "password")
+    wait: str = "event"
+    challenge: tuple = ("frame", "coordinate")
+    verify: tuple = ("expiry", "banner", "reload")
+    timeout: float = 15           # 事件等待上限（秒）
+    fixed_wait: float = 20        # 固定等待时长（秒）
+    challenge_timeout: float = 20
+    screenshots: bool = False     # 每一步截图进入内存缓冲区，失败时随调试包一起保存
+
+    def describe(self):
+        return (
+            f"login={'+'.join(self.login)} wait={self.wait} "
+            f"challenge={'+'.join(self.challenge)} verify={'+'.join(self.verify)}"
+        )
+
+
+# 四个脚本原有行为对应的策略组合
+PRESETS = {
+    "main": Strategy(challenge=("frame",), verify=("expiry", "reload")),
+    "main1": Strategy(login=("cookie", "password"), challenge=("none",), timeout=20, verify=("expiry", "reload")),
+    "test": Strategy(login=("cookie", "password"), challenge=("none",), timeout=10),
+    "test1": Strategy(
+        login=("cookie", "password"), challenge=("coordinate",), timeout=6,
+        challenge_timeout=25, verify=("reload", "banner"), screenshots=True,
+    ),
+}
+
+
+def resolve_credentials(account):
+    """
+    凭据从环境变量读取，配置文件里只写变量名；
+    只有来自 secret 的 ACCOUNTS_MANIFEST 才应直接写入 remember_cookie / email / password
+    """
+    account["remember_cookie"] = account.get("remember_cookie") or os.getenv(account.get("cookie_env", "REMEMBER_WEB_COOKIE"))
+    account["email"] = account.get("email") or os.getenv(account.get("email_env", "PTERODACTYL_EMAIL"))
+    account["password"] = account.get("password") or os.getenv(account.get("password_env", "PTERODACTYL_PASSWORD"))
+    return account
+
+
+class Limit:
+    """同时占用多个信号量（账号级上限 + 全局页面上限）"""
+
+    def __init__(self, *semaphores):
+        self.semaphores = semaphores
+
+    async def __aenter__(self):
+        for sem in self.semaphores:
+            await sem.acquire()
+
+    async def __aexit__(self, *exc):
+        for sem in reversed(self.semaphores):
+            sem.release()
+
+
+# ===================== 登录策略 =====================
+# 返回 True 表示 context 已处于登录状态
+async def login_storage(context, page, account, url):
+    # 缓存会话在创建 context 时已注入，并已通过 HTTP 校验，无需再打开页面
+    return account.get("state") is not None
+
+
+async def login_cookie(context, page, account, url):
+    if not account["remember_cookie"]:
+        return False
+    await context.add_cookies([remember_cookie(account["remember_cookie"])])
+    await page.goto(url, wait_until="domcontentloaded")
+    if "login" in page.url:
+        print(f"⚠️ [{account['name']}] Cookie 失效")
+        await context.clear_cookies()
+        return False
+    return True
+
+
+async def login_password(context, page, account, url):
+    if not (account["email"] and account["password"]):
+        return False
+    await page.goto(LOGIN_URL, wait_until="domcontentloaded")
+    await page.fill('input[name="username"]', account["email"])
+    await page.fill('input[name="password"]', account["password"])
+    async with page.expect_navigation(wait_until="domcontentloaded"):
+        await page.click('button[type="submit"]')
+    return "login" not in page.url
+
+
+LOGIN_STRATEGIES = {"storage": login_storage, "cookie": login_cookie, "password": login_password}
+
+
+async def login(context, account, strategy):
+    """每个账号只登录一次，之后同一 context 内的所有页面共享 Cookie"""
+    name = account["name"]
+    page = await context.new_page()
+    recorder = ArtifactRecorder(page, f"{name}-login")
+    try:
+        for method in strategy.login:
+            if await LOGIN_STRATEGIES[method](context, page, account, server_url(account["servers"][0])):
+                print(f"✅ [{name}] {method} 登录成功")
+                return method
+        raise RuntimeError(f"[{name}] 登录失败（已尝试 {'/'.join(strategy.login)}）")
+    except Exception as e:
+        # Cookie 过期、密码错误是最常见的失败，登录页在关闭前先打包
+        await recorder.snap("error")
+        await recorder.persist(str(e).split("\n", 1)[0] or type(e).__name__)
+        raise
+    finally:
+        await page.close()
+
+
+# ===================== 等待策略 =====================
+class EventWait:
+    """等到文本变化 / 提示 / 接口响应 / 验证框出现之一，结果一确定立即返回"""
+
+    async def outcome(self, page, before, strategy):
+        return await async_wait_for_outcome(page, before, timeout=strategy.timeout * 1000, stop_on_challenge=True)
+
+    async def challenge(self, page, strategy):
+        return await solve(page, strategy.challenge, timeout=strategy.challenge_timeout * 1000)
+
+
+class FixedWait:
+    """原脚本的固定 sleep，等待结束后只检查一次页面状态，作为对照组"""
+
+    async def outcome(self, page, before, strategy):
+        await page.wait_for_timeout(strategy.fixed_wait * 1000)
+        return await async_wait_for_outcome(page, before, timeout=500, stop_on_challenge=True)
+
+    async def challenge(self, page, strategy):
+        return await solve(page, strategy.challenge, timeout=strategy.fixed_wait * 1000, fixed=True)
+
+
+WAIT_POLICIES = {"event": EventWait(), "fixed": FixedWait()}
+
+
+# ===================== 结果校验 =====================
+# 返回 (status, after) 表示已判定，返回 None 交给下一个校验器
+async def verify_expiry(reader, before, outcome):
+    after = outcome.get("expire")
+    if not after and outcome["status"] == "accepted":
+        # 接口已成功但文本未更新：等页面或服务器详情接口给出新值
+        after = await reader.watch(before, timeout=3000)
+    after = after or await reader.read()
+    if after and (not before or after > before):
+        return "renewed", after
+    return None
+
+
+async def verify_banner(reader, before, outcome):
+    content = await reader.page.content()
+    if outcome["status"] == "limited" or any(m in content for m in LIMITED_MARKERS):
+        return "limited", before
+    return None
+
+
+async def verify_reload(reader, before, outcome):
+    await reader.page.reload(wait_until="domcontentloaded")
+    after = await reader.read()
+    if after and before and after > before:
+        return "renewed", after
+    return None
+
+
+VERIFIERS = {"expiry": verify_expiry, "banner": verify_banner, "reload": verify_reload}
+
+
+# ===================== 单台服务器 =====================
+async def renew_server(context, server_id, pool, strategy, relogin=None):
+    result = {"server": server_id, "before": None, "after": None, "status": "failed", "error": None, "failure": None}
+    timer = PhaseTimer(server_id)
+    budget = RetryBudget(server_id, gate=default_admission())
+    wait = WAIT_POLICIES[strategy.wait]
+    url = server_url(server_id)
+    start = time.monotonic()
+    async with pool:
+        page = await context.new_page()
+        page.set_default_timeout(60000)
+        # 在导航前挂上，才能截获前端请求的服务器详情接口
+        reader = ExpiryReader(page)
+
+        recorder = ArtifactRecorder(page, server_id)
+
+        async def snapshot(step):
+            if strategy.screenshots:
+                await recorder.snap(step)
+
+        # ---------- 各阶段（失败时由 RetryBudget 只重试该阶段） ----------
+        async def open_page():
+            await async_goto_ready(page, url)
+            if "login" in page.url:
+                raise LoginRedirect("会话已失效，被重定向到登录页")
+
+        async def read_before():
+            before = await reader.read()
+            if not before:
+                raise ParseFailure("无法解析到期时间")
+            return before
+
+        async def click():
+            from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+            add_button = page.locator(READY_SELECTOR)
+            try:
+                await add_button.wait_for(state="visible", timeout=15000)
+            except PlaywrightTimeoutError:
+                raise NetworkTimeout("未找到 시간추가 按钮")
+            await add_button.click()
+            return await wait.outcome(page, result["before"], strategy)
+
+        async def solve_challenge():
+            result["challenge"] = await wait.challenge(page, strategy)
+            outcome = await wait.outcome(page, result["before"], strategy)
+            if outcome["status"] == "challenge":
+                raise ChallengeFailed("Turnstile 验证未通过")
+            return outcome
+
+        async def verify():
+            for name in strategy.verify:
+                verdict = await VERIFIERS[name](reader, result["before"], outcome)
+                if verdict:
+                    return verdict
+            if outcome["status"] == "limited":
+                raise RateLimited("本周期已续期过（once at one time period）")
+            raise ParseFailure(f"到期时间未增加（{outcome['status']}）")
+
+        async def recover_login(failure):
+            if failure.kind == "login" and relogin:
+                await relogin()
+
+        async def recover_page(failure):
+            # 在当前 page 上重新打开服务器页，不重建 context
+            await recover_login(failure)
+            await open_page()
+
+        try:
+            with timer.phase("navigation"):
+                await budget.run("navigation", open_page, recover_login)
+            await snapshot("step1_login_check")
+
+            with timer.phase("expiry_parse"):
+                result["before"] = await budget.run("expiry_parse", read_before, recover_page)
+
+            with timer.phase("click"):
+                outcome = await budget.run("click", click, recover_page)
+            await snapshot("step2_cf_appear")
+            if outcome["status"] == "challenge":
+                with timer.phase("challenge"):
+                    outcome = await budget.run("challenge", solve_challenge)
+                await snapshot("step3_after_click")
+            await snapshot("step4_after_wait")
+
+            with timer.phase("verification"):
+                result["status"], result["after"] = await budget.run("verification", verify)
+            await snapshot("step5_final_check")
+        except Exception as e:
+            failure = classify(e)
+            result["error"] = str(failure)
+            result["failure"] = failure.kind
+            await recorder.snap("error")
+        finally:
+            # 只有失败或结果不在预期内时才把调试产物写盘
+            if not expected(result["status"]):
+                result["artifacts"] = await recorder.persist(result["error"] or result["status"])
+            await page.close()
+    record_expiry(server_id, result["after"] or result["before"])
+    result["seconds"] = round(time.monotonic() - start, 2)
+    result["phases"] = {k: round(v, 3) for k, v in timer.durations.items()}
+    result["retries"] = budget.history
+    return result
+
+
+# ===================== 账号 =====================
+async def renew_account(browser, account, pool, trace, strategy=None, label=None, digest=True):
+    """
+    label 非空时 span 名带上账号名（多账号并发时各账号的 context / login 耗时分开记录）；
+    digest=False 时结果不进进程级 digest，由调用方自行通知（daemon 的并发任务各自发送汇总）
+    """
+    strategy = strategy or Strategy()
+    suffix = f"[{label}]" if label else ""
+    store = SessionStore(
+        account["name"],
+        credential_secret(account["remember_cookie"], account["email"], account["password"]),
+    )
+    account["state"] = await asyncio.to_thread(store.load_valid) if "storage" in strategy.login else None
+    with trace.span(f"context{suffix}"):
+        context = await browser.new_context(**context_options(), storage_state=account["state"])
+        await context.add_init_script(STEALTH_SCRIPT)
+        await context.add_init_script(RESPONSE_HOOK_SCRIPT)
+    context.on("response", default_admission().observe_response)
+    blocker = RequestBlocker()
+    if blocker.enabled():
+        await blocker.install(context)
+    if trace.browser_trace_path:
+        await context.tracing.start(screenshots=True, snapshots=True)
+    if account.get("concurrency"):
+        # 先占账号名额再占全局名额，避免占着全局页面空等
+        pool = Limit(asyncio.Semaphore(account["concurrency"]), pool)
+    lock = asyncio.Lock()
+
+    async def relogin():
+        # 多台服务器可能同时发现会话失效，只重新登录一次
+        async with lock:
+            if account.get("relogged"):
+                return
+            account["state"], account["relogged"] = None, True
+            await login(context, account, strategy)
+            store.save(await context.storage_state())
+
+    # 登录是账号级耗时，每个账号单独记一行，不重复计入每台服务器
+    started = time.monotonic()
+    try:
+        try:
+            with trace.span(f"login{suffix}"):
+                await RetryBudget(account["name"], gate=default_admission()).run("login", lambda: login(context, account, strategy))
+            record_account(trace.name, account["name"], {"login": round(time.monotonic() - started, 3)})
+            # Laravel 会轮换 session Cookie，每次都保存最新会话
+            store.save(await context.storage_state())
+        except Exception as e:
+            print(traceback.format_exc())
+            record_account(trace.name, account["name"], {"login": round(time.monotonic() - started, 3)})
+            failure = classify(e)
+            results = [
+                {"server": s, "before": None, "after": None, "status": "failed", "error": str(e),
+                 "failure": "login" if failure.kind == "unknown" else failure.kind, "seconds": 0}
+                for s in account["servers"]
+            ]
+        else:
+            results = await asyncio.gather(
+                *(renew_server(context, s, pool, strategy, relogin) for s in account["servers"])
+            )
+        if digest:
+            # 结果先进 digest，运行结束时合并成一条 Telegram 消息
+            for r in results:
+                default_notifier().add_to_digest(r["server"], format_line(r))
+        record_history(trace.name, account["name"], results)
+        return results
+    finally:
+        print(f"[{account['name']}] {blocker.report()}")
+        if trace.browser_trace_path:
+            await context.tracing.stop(path=trace.browser_trace_path.replace("-trace.zip", f"-{account['name']}-trace.zip"))
+        await context.close()
+
+
+async def run(accounts, strategy, concurrency, trace):
+    # playwright 在真正启动浏览器时才导入，预检后跳过或推迟的运行不必加载它
+    from playwright.async_api import async_playwright
+
+    pool = asyncio.Semaphore(concurrency)
+    async with async_playwright() as p:
+        with trace.span("launch"):
+            browser = await p.chromium.launch(headless=True)
+        # 一个进程只启动一次浏览器，同样只记一行
+        record_account(trace.name, None, {"launch": round(trace.durations["launch"], 3)})
+        try:
+            labelled = len(accounts) > 1
+            per_account = await asyncio.gather(*(
+                renew_account(browser, a, pool, trace, strategy, a["name"] if labelled else None) for a in accounts
+            ))
+        finally:
+            await browser.close()
+            trace.set(admission=default_admission().stats())
+    return [r for results in per_account for r in results]
+
+
+# ===================== 汇总报告 =====================
+STATUS_ICON = {"renewed": "✅", "limited": "ℹ️", "failed": "❌", "skipped": "💤", "deferred": "⏸"}
+
+
+def format_line(r):
+    line = f"{STATUS_ICON[r['status']]} <code>{r['server']}</code> {r['before']} → {r['after']}"
+    if r["error"]:
+        line += f"\n    {r['error']}"
+    return line
+
+
+def format_title(results, elapsed, label="批量续期"):
+    return f"<b>{label}完成</b>（{len(results)} 台，耗时 {elapsed:.1f}s）"
+
+
+def format_report(results, elapsed, label="批量续期"):
+    return "\n".join([format_title(results, elapsed, label), ""] + [format_line(r) for r in results])
+
+
+# ===================== 入口 =====================
+def held_result(check):
+    """预检决定不启动浏览器的服务器，转成与续期结果相同的结构"""
+    status = "skipped" if check["decision"] == "skip" else "deferred"
+    return {
+        "server": check["server"], "before": check["expire"], "after": check["expire"], "status": status,
+        "error": check["reason"] if status == "deferred" else None, "failure": None, "seconds": check["seconds"],
+    }
+
+
+def renew_servers(strategy, servers, name="core", probe=PREFLIGHT_ENABLED):
+    """同步入口：用默认账号续期若干台服务器，返回是否全部成功"""
+    print(f"🧩 策略: {strategy.describe()}")
+    account = resolve_credentials({"name": "default", "servers": servers})
+    trace = RunTrace(name)
+    trace.set(strategy=asdict(strategy), servers=servers)
+    start = time.monotonic()
+    held = []
+    if probe:
+        with trace.span("preflight"):
+            checks = preflight(account, name)
+        trace.set(preflight=checks)
+        held = [held_result(c) for c in checks if c["decision"] != "run"]
+        account["servers"] = [c["server"] for c in checks if c["decision"] == "run"]
+        for r in held:
+            # 面板故障需要知道；只是窗口未到则不打扰
+            if r["status"] == "deferred":
+                default_notifier().add_to_digest(r["server"], format_line(r))
+    if account["servers"]:
+        results = asyncio.run(run([account], strategy, max(1, len(account["servers"])), trace))
+    else:
+        print("🛑 预检后没有需要续期的服务器，不启动浏览器")
+        results = []
+    results = sorted(held + results, key=lambda r: servers.index(r["server"]))
+    elapsed = time.monotonic() - start
+    print(format_report(results, elapsed, "续期"))
+    with trace.span("telegram"):
+        default_notifier().flush(format_title(results, elapsed, "续期"))
+
+    ok = all(r["status"] != "failed" for r in results)
+    if not account["servers"]:
+        outcome = "deferred" if any(r["status"] == "deferred" for r in held) else "skipped"
+    else:
+        outcome = "renewed" if ok else "failed"
+    trace.set(outcome=outcome, results=results)
+    trace.write()
+    return ok
+
+
+def run_preset(name, **overrides):
+    return renew_servers(replace(PRESETS[name], **overrides), [DEFAULT_SERVER_ID], name)
+
+
+def _names(value, choices):
+    names = tuple(v.strip() for v in value.split(",") if v.strip())
+    unknown = [n for n in names if n not in choices]
+    if unknown or not names:
+        raise argparse.ArgumentTypeError(f"可选值: {', '.join(choices)}")
+    return names
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="可组合策略的浏览器续期")
+    parser.add_argument("--preset", choices=sorted(PRESETS), help="以某个脚本的策略组合为基础")
+    parser.add_argument("--login", type=lambda v: _names(v, LOGIN_STRATEGIES), help="逗号分隔，按顺序尝试")
+    parser.add_argument("--wait", choices=sorted(WAIT_POLICIES))
+    parser.add_argument("--challenge", type=lambda v: _names(v, CHALLENGE_STRATEGIES), help="逗号分隔，按顺序尝试")
+    parser.add_argument("--verify", type=lambda v: _names(v, VERIFIERS), help="逗号分隔，按顺序判定")
+    parser.add_argument("--timeout", type=float, help="事件等待上限（秒）")
+    parser.add_argument("--fixed-wait", type=float, help="固定等待时长（秒）")
+    parser.add_argument("--challenge-timeout", type=float)
+    parser.add_argument("--screenshots", action="store_true", default=None, help="每一步截图（仅失败时落盘）")
+    parser.add_argument("--servers", default=DEFAULT_SERVER_ID, help="逗号分隔的服务器 ID")
+    parser.add_argument("--no-preflight", dest="probe", action="store_false", default=PREFLIGHT_ENABLED, help="跳过 HTTP 预检，总是启动浏览器")
+    args = parser.parse_args(argv)
+
+    strategy = PRESETS[args.preset] if args.preset else Strategy()
+    overrides = {
+        k: v for k, v in vars(args).items()
+        if v is not None and k not in ("preset", "servers", "probe")
+    }
+    strategy = replace(strategy, **overrides)
+    servers = [s.strip() for s in args.servers.split(",") if s.strip()]
+    return renew_servers(strategy, servers, f"core-{args.preset or 'custom'}", args.probe)
+
+
+if __name__ == "__main__":
+    exit(0 if main() else 1)
@@ -0,0 +1,184 @@
+"""
+常驻浏览器守护进程（自托管 runner 使用）：保持一个 Chromium（或外部 CDP 端点）常驻，
+通过本地 TCP 套接字接收续期任务，每个任务使用带缓存会话的全新 context，省去每次冷启动。
+
+协议：每行一个 JSON 请求，返回一行 JSON
+  {"cmd": "renew", "servers": ["e66c2244"]}
+  {"cmd": "health"}
+
+用法：
+  python -m weirdhost.daemon serve
+  python -m weirdhost.daemon renew e66c2244 [...]
+  python -m weirdhost.daemon health
+
+环境变量：
+  DAEMON_ADDR          监听地址，默认 127.0.0.1:8799
+  DAEMON_CONCURRENCY   并发页面数，默认 4
+  DAEMON_MAX_RSS_MB    浏览器进程树内存上限，超过后空闲时自动重启，默认 1024
+  BROWSER_CDP_URL      连接已有浏览器的 CDP 端点，而不是自行启动
+"""
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import traceback
+
+from weirdhost.common import DEFAULT_SERVER_ID
+from weirdhost.notifier import default_notifier
+from weirdhost.procstat import tree_rss
+from weirdhost.tracing import RunTrace
+
+HOST, _, PORT = os.getenv("DAEMON_ADDR", "127.0.0.1:8799").rpartition(":")
+CONCURRENCY = int(os.getenv("DAEMON_CONCURRENCY") or "4")
+MAX_RSS = int(os.getenv("DAEMON_MAX_RSS_MB") or "1024") * 2 ** 20
+WATCH_INTERVAL = 30
+
+
+class BrowserDaemon:
+    def __init__(self):
+        self.playwright = None
+        self.browser = None
+        self.pool = asyncio.Semaphore(CONCURRENCY)
+        self.active = 0
+        self.jobs = 0
+        self.restarts = 0
+        self.started = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    # ---------- 浏览器生命周期 ----------
+    async def launch(self):
+        cdp_url = os.getenv("BROWSER_CDP_URL")
+        if cdp_url:
+            self.browser = await self.playwright.chromium.connect_over_cdp(cdp_url)
+        else:
+            self.browser = await self.playwright.chromium.launch(headless=True)
+        print(f"🌐 浏览器已就绪（{cdp_url or 'chromium'}）")
+
+    async def restart(self, reason):
+        print(f"♻️ 重启浏览器：{reason}")
+        try:
+            await self.browser.close()
+        except Exception:
+            pass
+        await self.launch()
+        self.restarts += 1
+
+    def rss(self):
+        # 外部 CDP 浏览器不属于本进程树，只能统计驱动进程
+        return tree_rss(os.getpid())
+
+    async def watchdog(self):
+        while True:
+            await asyncio.sleep(WATCH_INTERVAL)
+            async with self.lock:
+                if not self.browser.is_connected():
+                    await self.restart("浏览器连接已断开")
+                elif self.active == 0 and (self.rss() or 0) > MAX_RSS:
+                    await self.restart(f"内存超过 {MAX_RSS // 2 ** 20} MB")
+
+    # ---------- 任务 ----------
+    async def renew(self, servers):
+        from weirdhost.core import format_report, renew_account, resolve_credentials
+
+        async with self.lock:
+            if not self.browser.is_connected():
+                await self.restart("浏览器连接已断开")
+            self.active += 1
+        try:
+            trace = RunTrace("daemon")
+            account = resolve_credentials({"name": "default", "servers": servers})
+            start = time.monotonic()
+            # 并发任务共用进程级 digest 会互相带走结果，每个任务单独发送自己的汇总
+            results = await renew_account(self.browser, account, self.pool, trace, digest=False)
+            self.jobs += 1
+            trace.set(outcome="renewed" if all(r["status"] != "failed" for r in results) else "failed", results=results)
+            trace.write()
+            elapsed = time.monotonic() - start
+            print(format_report(results, elapsed))
+            # 只把汇总消息放入队列，不等待发送完成
+            default_notifier().send(format_report(results, elapsed))
+            return {"ok": True, "results": json.loads(json.dumps(results, default=str))}
+        finally:
+            self.active -= 1
+
+    def health(self):
+        rss = self.rss()
+        return {
+            "ok": self.browser is not None and self.browser.is_connected(),
+            "uptime": round(time.monotonic() - self.started, 1),
+            "active": self.active,
+            "jobs": self.jobs,
+            "restarts": self.restarts,
+            "rss_mb": round(rss / 2 ** 20, 1) if rss is not None else None,
+        }
+
+    async def handle(self, reader, writer):
+        try:
+            line = await reader.readline()
+            req = json.loads(line or b"{}")
+            if req.get("cmd") == "health":
+                resp = self.health()
+            elif req.get("cmd") == "renew":
+                resp = await self.renew(req.get("servers") or [DEFAULT_SERVER_ID])
+            else:
+                resp = {"ok": False, "error": f"未知命令: {req.get('cmd')}"}
+        except Exception as e:
+            print(traceback.format_exc())
+            resp = {"ok": False, "error": str(e)}
+        writer.write(json.dumps(resp, ensure_ascii=False).encode() + b"\n")
+        await writer.drain()
+        writer.close()
+
+    async def serve(self):
+        # 客户端命令（renew / health）只走套接字，playwright 和续期核心只在守护进程里加载
+        from playwright.async_api import async_playwright
+
+        async with async_playwright() as p:
+            self.playwright = p
+            await self.launch()
+            server = await asyncio.start_server(self.handle, HOST, int(PORT))
+            print(f"🛰 守护进程监听 {HOST}:{PORT}")
+            watchdog = asyncio.create_task(self.watchdog())
+            try:
+                async with server:
+                    await server.serve_forever()
+            finally:
+                watchdog.cancel()
+                await self.browser.close()
+
+
+# ===================== 客户端 =====================
+def request(payload, timeout=600):
+    with socket.create_connection((HOST, int(PORT)), timeout=timeout) as sock:
+        sock.sendall(json.dumps(payload).encode() + b"\n")
+        data = b""
+        while not data.endswith(b"\n"):
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            data += chunk
+    return json.loads(data)
+
+
+def main(argv):
+    cmd = argv[0] if argv else "serve"
+    if cmd == "serve":
+        asyncio.run(BrowserDaemon().serve())
+        return True
+    if cmd == "health":
+        resp = request({"cmd": "health"}, timeout=10)
+    elif cmd == "renew":
+        resp = request({"cmd": "renew", "servers": argv[1:] or [DEFAULT_SERVER_ID]})
+    else:
+        print(f"未知命令: {cmd}")
+        return False
+    print(json.dumps(resp, ensure_ascii=False, indent=2))
+    if cmd == "renew":
+        return resp.get("ok") and all(r["status"] != "failed" for r in resp["results"])
+    return resp.get("ok", False)
+
+
+if __name__ == "__main__":
+    exit(0 if main(sys.argv[1:]) else 1)
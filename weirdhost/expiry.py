@@ -0,0 +1,112 @@
+"""
+到期时间读取层：不再反复 wait_for_selector + locator.inner_text() 扫描页面，
+  - 监听面板前端请求的服务器详情接口（/api/client/servers/<id>），响应到达即得到 유통기한
+  - 否则用一次 page.evaluate（wait_for_function 首次求值即返回）从页面文本中取值
+  - 同一页面状态内缓存读取结果，页面导航或续期接口返回后自动失效
+  - watch(before) 立即返回一个 Task，在到期时间晚于 before 时完成，可在点击前先挂上
+"""
+import asyncio
+import re
+from urllib.parse import urlparse
+
+from weirdhost.common import find_expire, parse_expire
+from weirdhost.waits import RENEW_API_PATTERN
+
+SERVER_API_RE = re.compile(r"/api/client/servers/[^/]+$")
+
+# 返回到期时间字符串；给定 before 时只在更晚的时间出现后返回，否则返回 false 继续等待
+EXPIRE_SCRIPT = """
+(before) => {
+    const text = document.body ? document.body.innerText : '';
+    const m = text.match(/유통기한[^0-9]{0,40}(\\d{4}-\\d{2}-\\d{2} \\d{2}:\\d{2}:\\d{2})/);
+    if (!m || (before && m[1] <= before)) return false;
+    return m[1];
+}
+"""
+
+
+def _fmt(dt):
+    return dt.strftime("%Y-%m-%d %H:%M:%S") if dt else None
+
+
+class ExpiryReader:
+    def __init__(self, page):
+        self.page = page
+        self.value = None
+        self.source = None
+        self._waiters = []
+        self._renew_re = re.compile(RENEW_API_PATTERN)
+        page.on("response", self._on_response)
+        page.on("framenavigated", self._on_navigated)
+
+    # ---------- 缓存维护 ----------
+    def _on_navigated(self, frame):
+        if frame == self.page.main_frame:
+            self.value = None
+
+    async def _on_response(self, response):
+        path = urlparse(response.url).path
+        if self._renew_re.search(path):
+            # 续期接口返回后页面上的到期时间可能已变化
+            self.value = None
+            return
+        if not (SERVER_API_RE.search(path) and response.ok):
+            return
+        try:
+            expire = find_expire(await response.json())
+        except Exception:
+            return
+        if expire:
+            self._update(expire, "api")
+
+    def _update(self, expire, source):
+        self.value, self.source = expire, source
+        for before, future in self._waiters:
+            if not future.done() and (before is None or expire > before):
+                future.set_result(expire)
+
+    # ---------- 读取 ----------
+    async def read(self, timeout=10000):
+        """返回当前到期时间；同一页面状态内只读一次，读不到返回 None"""
+        if self.value:
+            return self.value
+        from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+        try:
+            handle = await self.page.wait_for_function(EXPIRE_SCRIPT, arg=None, timeout=timeout, polling=100)
+        except PlaywrightTimeoutError:
+            return self.value
+        # 等待期间接口响应可能已先到达
+        if not self.value:
+            self.value, self.source = parse_expire(await handle.json_value()), "dom"
+        return self.value
+
+    def watch(self, before, timeout=15000):
+        """
+        不阻塞：立即返回 Task，到期时间晚于 before 时得到新值，超时得到 None。
+        页面文本和服务器详情接口任一先出现新值即完成。
+        """
+        return asyncio.ensure_future(self._watch(before, timeout))
+
+    async def _watch(self, before, timeout):
+        future = asyncio.get_running_loop().create_future()
+        waiter = (before, future)
+        self._waiters.append(waiter)
+        dom = asyncio.ensure_future(
+            self.page.wait_for_function(EXPIRE_SCRIPT, arg=_fmt(before), timeout=timeout, polling=100)
+        )
+        try:
+            await asyncio.wait([future, dom], return_when=asyncio.FIRST_COMPLETED)
+            if future.done():
+                return future.result()
+            try:
+                expire = parse_expire(await (await dom).json_value())
+            except Exception:
+                return None
+            self._update(expire, "dom")
+            return expire
+        finally:
+            self._waiters.remove(waiter)
+            if not dom.done():
+                dom.cancel()
+            if not future.done():
+                future.cancel()
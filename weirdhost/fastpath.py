@@ -0,0 +1,156 @@
+"""
+无浏览器快速续期：复用会话 Cookie，直接通过面板的 Pterodactyl 客户端 API
+读取到期时间并调用续期接口。只有接口真正返回验证挑战（或会话失效）时，
+才回退到浏览器续期（weirdhost.core 的 main 预设）。
+"""
+import os
+from urllib.parse import unquote
+import requests
+
+from weirdhost.common import (
+    BASE_URL, DEFAULT_SERVER_ID, LIMITED_MARKERS, REMEMBER_COOKIE_NAME, USER_AGENT,
+    cookie_domain, find_expire, send_telegram, server_url,
+)
+from weirdhost.history import record as record_history
+from weirdhost.scheduler import record_expiry
+from weirdhost.session_store import SessionStore, credential_secret
+from weirdhost.tracing import RunTrace
+
+SERVER_API = BASE_URL + "/api/client/servers/{server_id}"
+RENEW_API = BASE_URL + os.getenv("RENEW_API_PATH", "/api/client/notfreeservers/{server_id}/renew")
+
+CHALLENGE_MARKERS = ("challenge-platform", "cf-turnstile", "turnstile", "captcha", "Just a moment")
+
+
+class ChallengeRequired(Exception):
+    """接口要求人机验证、会话失效或接口与预期不符（4xx），需要浏览器处理"""
+
+
+# ===================== 会话 =====================
+def build_session(remember_cookie=None, state=None):
+    session = requests.Session()
+    session.headers.update({
+        "User-Agent": USER_AGENT,
+        "Accept": "application/json",
+        "X-Requested-With": "XMLHttpRequest",
+        "Referer": BASE_URL + "/",
+    })
+    for c in (state or {}).get("cookies", []):
+        session.cookies.set(c["name"], c["value"], domain=c["domain"], path=c.get("path", "/"))
+    if remember_cookie and REMEMBER_COOKIE_NAME not in session.cookies:
+        session.cookies.set(REMEMBER_COOKIE_NAME, remember_cookie, domain=cookie_domain(), path="/")
+    return session
+
+
+def _check(resp):
+    """登录跳转或 Cloudflare 挑战时抛出 ChallengeRequired"""
+    if resp.status_code in (401, 419) or "/auth/login" in resp.headers.get("Location", ""):
+        raise ChallengeRequired(f"会话无效（HTTP {resp.status_code}）")
+    if resp.headers.get("cf-mitigated") == "challenge":
+        raise ChallengeRequired("Cloudflare 返回了验证挑战")
+    if resp.status_code >= 400 and any(m in resp.text for m in CHALLENGE_MARKERS):
+        raise ChallengeRequired(f"接口要求人机验证（HTTP {resp.status_code}）")
+
+
+def _unsupported(resp):
+    """
+    接口路径是按 Pterodactyl 推测的；除 429 外的 4xx（404 / 405 / 422 ...）说明接口与预期不符，
+    交给浏览器走页面按钮，而不是直接判定失败
+    """
+    if 400 <= resp.status_code < 500 and resp.status_code != 429:
+        raise ChallengeRequired(f"接口返回 HTTP {resp.status_code}（{resp.url}）")
+
+
+# ===================== 到期时间 =====================
+def get_expire(session, server_id, timeout=10):
+    resp = session.get(SERVER_API.format(server_id=server_id), allow_redirects=False, timeout=timeout)
+    _check(resp)
+    _unsupported(resp)
+    resp.raise_for_status()
+    try:
+        data = resp.json()
+    except ValueError:
+        # 被拦截时 Cloudflare 可能返回 200 的 HTML 页面
+        raise ChallengeRequired("服务器详情接口返回了非 JSON 内容")
+    return find_expire(data)
+
+
+# ===================== 续期 =====================
+def renew(session, server_id, timeout=15):
+    """
+    返回 dict：status 为 renewed / limited / failed，附带 before / after
+    需要浏览器时抛出 ChallengeRequired
+    """
+    before = get_expire(session, server_id, timeout)
+    xsrf = session.cookies.get("XSRF-TOKEN")
+    headers = {"X-XSRF-TOKEN": unquote(xsrf)} if xsrf else {}
+    resp = session.post(
+        RENEW_API.format(server_id=server_id), headers=headers, allow_redirects=False, timeout=timeout
+    )
+    _check(resp)
+
+    if any(m in resp.text for m in LIMITED_MARKERS):
+        return {"status": "limited", "before": before, "after": before}
+    _unsupported(resp)
+    if resp.status_code >= 400:
+        return {"status": "failed", "before": before, "after": None, "error": f"HTTP {resp.status_code}: {resp.text[:200]}"}
+
+    after = get_expire(session, server_id, timeout)
+    status = "renewed" if after and (not before or after > before) else "failed"
+    return {"status": status, "before": before, "after": after}
+
+
+def main():
+    server_id = DEFAULT_SERVER_ID
+    remember_cookie = os.getenv("REMEMBER_WEB_COOKIE")
+    email = os.getenv("PTERODACTYL_EMAIL")
+    password = os.getenv("PTERODACTYL_PASSWORD")
+
+    store = SessionStore("default", credential_secret(remember_cookie, email, password))
+    session = build_session(remember_cookie, store.load())
+
+    trace = RunTrace("fastpath")
+    trace.set(server=server_url(server_id))
+    try:
+        with trace.span("api_renew"):
+            result = renew(session, server_id)
+    except ChallengeRequired as e:
+        print(f"🧩 {e}，回退到浏览器续期")
+        trace.set(outcome="fallback", challenge=True, error=str(e))
+        trace.write()
+        from weirdhost.core import run_preset
+        return run_preset("main")
+    except requests.RequestException as e:
+        print(f"❌ 接口请求失败: {e}")
+        trace.set(outcome="failed", error=str(e))
+        record_history("fastpath", "default", [{"server": server_id, "status": "failed", "failure": "timeout", "error": str(e)}])
+        with trace.span("telegram"):
+            send_telegram(f"❌ <b>快速续期失败</b>\n{e}")
+        trace.write()
+        return False
+
+    print(f"⚡ 快速续期 {result['status']}：{result['before']} → {result['after']}")
+    trace.set(outcome=result["status"], before=result["before"], after=result["after"], error=result.get("error"))
+    record_expiry(server_id, result["after"] or result["before"])
+    record_history("fastpath", "default", [{
+        "server": server_id, **result,
+        "seconds": round(trace.durations["api_renew"], 2), "phases": trace.durations,
+    }])
+    with trace.span("telegram"):
+        if result["status"] == "renewed":
+            send_telegram(
+                "✅ <b>服务器时间增加成功</b>\n\n"
+                f"🕒 原到期时间: {result['before']}\n"
+                f"🕒 新到期时间: {result['after']}\n\n"
+                f"🔗 {server_url(server_id)}"
+            )
+        elif result["status"] == "limited":
+            send_telegram(f"✅ <b>续期状态正常</b>\n当前已是最新状态: {result['before']}")
+        else:
+            send_telegram(f"❌ <b>快速续期失败</b>\n{result.get('error', '到期时间未增加')}")
+    trace.write()
+    return result["status"] in ("renewed", "limited")
+
+
+if __name__ == "__main__":
+    exit(0 if main() else 1)
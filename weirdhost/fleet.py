@@ -0,0 +1,73 @@
+"""
+多服务器并发续期：一个 Chromium、每个账号登录一次、有限数量的页面并发续期。
+
+服务器列表来源（优先级从高到低）：
+  1. 环境变量 SERVER_IDS="e66c2244,abcd1234"（使用默认账号环境变量）
+  2. 环境变量 ACCOUNTS_MANIFEST：JSON 内容（通常来自 secret，可直接写入凭据）
+  3. FLEET_CONFIG 指定的 JSON 文件（默认 servers.json），格式见 servers.example.json
+"""
+import os
+import json
+import time
+import asyncio
+
+from weirdhost.core import Strategy, format_report, format_title, resolve_credentials, run
+from weirdhost.notifier import default_notifier
+from weirdhost.scheduler import due_servers
+from weirdhost.tracing import RunTrace
+
+DEFAULT_CONCURRENCY = 4
+
+
+# ===================== 配置加载 =====================
+def load_config(path=None):
+    path = path or os.getenv("FLEET_CONFIG", "servers.json")
+    concurrency = int(os.getenv("FLEET_CONCURRENCY", "0") or 0)
+
+    ids = [s.strip() for s in os.getenv("SERVER_IDS", "").split(",") if s.strip()]
+    if ids:
+        config = {"accounts": [{"name": "default", "servers": ids}]}
+    elif os.getenv("ACCOUNTS_MANIFEST"):
+        config = json.loads(os.environ["ACCOUNTS_MANIFEST"])
+    elif os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            config = json.load(f)
+    else:
+        raise RuntimeError(f"未找到服务器列表（SERVER_IDS、ACCOUNTS_MANIFEST 或 {path}）")
+
+    config["concurrency"] = concurrency or config.get("concurrency", DEFAULT_CONCURRENCY)
+    for account in config["accounts"]:
+        resolve_credentials(account)
+        if os.getenv("FLEET_ONLY_DUE") == "1":
+            # 按 expire.txt 跳过续期窗口尚未打开的服务器
+            account["servers"] = due_servers(account["servers"])
+    config["accounts"] = [a for a in config["accounts"] if a["servers"]]
+    return config
+
+
+def main():
+    config = load_config()
+    total = sum(len(a["servers"]) for a in config["accounts"])
+    print(f"🚀 开始批量续期：{len(config['accounts'])} 个账号，{total} 台服务器，并发 {config['concurrency']}")
+
+    trace = RunTrace("fleet")
+    if not config["accounts"]:
+        print("🛑 没有需要续期的服务器，不启动浏览器")
+        trace.set(outcome="skipped", results=[])
+        trace.write()
+        return True
+    start = time.monotonic()
+    results = asyncio.run(run(config["accounts"], Strategy(), config["concurrency"], trace))
+    elapsed = time.monotonic() - start
+    print(format_report(results, elapsed))
+    with trace.span("telegram"):
+        default_notifier().flush(format_title(results, elapsed))
+
+    ok = all(r["status"] != "failed" for r in results)
+    trace.set(outcome="renewed" if ok else "failed", results=results)
+    trace.write()
+    return ok
+
+
+if __name__ == "__main__":
+    exit(0 if main() else 1)
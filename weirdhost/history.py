@@ -0,0 +1,196 @@
+"""
+运行历史：每台服务器每次续期追加一行 JSON 到 HISTORY_FILE（默认 .history/runs.jsonl），
+记录账号、服务器、续期前后的 유통기한、各阶段耗时、结果和是否遇到验证挑战。
+工作流通过 actions/cache 保留该文件，不再为了记录时间往仓库提交 time.txt。
+
+用法：
+  python -m weirdhost.history                 全部报告
+  python -m weirdhost.history --days 30       只统计最近 30 天
+  python -m weirdhost.history --server e66c2244
+"""
+import os
+import json
+import argparse
+from datetime import datetime, timedelta
+
+from weirdhost.common import panel_now, parse_expire, percentile
+
+HISTORY_FILE = os.getenv("HISTORY_FILE", os.path.join(".history", "runs.jsonl"))
+
+
+# ===================== 写入 =====================
+def record(run, account, results, path=None):
+    """追加本次运行的结果，每台服务器一行"""
+    path = path or HISTORY_FILE
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    at = datetime.now().isoformat(timespec="seconds")
+    with open(path, "a", encoding="utf-8") as f:
+        for r in results:
+            before, after = r.get("before"), r.get("after")
+            challenge = r.get("challenge")
+            f.write(json.dumps({
+                "at": at,
+                "run": run,
+                "account": account,
+                "server": r.get("server"),
+                "status": r["status"],
+                "failure": r.get("failure"),
+                "before": before,
+                "after": after,
+                "added_hours": round((after - before).total_seconds() / 3600, 2)
+                if r["status"] == "renewed" and before and after else None,
+                "seconds": r.get("seconds"),
+                "phases": r.get("phases", {}),
+                "challenge": (challenge.get("strategy") or "failed") if challenge else None,
+                "retries": len(r.get("retries") or []),
+            }, ensure_ascii=False, default=str) + "\n")
+
+
+def record_account(run, account, phases, path=None):
+    """
+    不属于某台服务器的阶段：浏览器启动每次运行一行（account 为空），登录每个账号一行；
+    server 为空，只计入阶段耗时，不参与按服务器的统计
+    """
+    path = path or HISTORY_FILE
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({
+            "at": datetime.now().isoformat(timespec="seconds"),
+            "run": run,
+            "account": account,
+            "server": None,
+            "status": "account",
+            "phases": phases,
+        }, ensure_ascii=False) + "\n")
+
+
+def servers_only(rows):
+    return [r for r in rows if r["server"]]
+
+
+def load(path=None, days=None, server=None):
+    path = path or HISTORY_FILE
+    if not os.path.exists(path):
+        return []
+    since = datetime.now() - timedelta(days=days) if days else None
+    rows = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except ValueError:
+                continue
+            row["at"] = datetime.fromisoformat(row["at"])
+            if (since and row["at"] < since) or (server and row["server"] != server):
+                continue
+            row["before"], row["after"] = parse_expire(row.get("before")), parse_expire(row.get("after"))
+            rows.append(row)
+    return rows
+
+
+# ===================== 统计 =====================
+def latency(rows):
+    ok = [r["seconds"] for r in servers_only(rows) if r["status"] != "failed" and r["seconds"]]
+    phases = {}
+    for r in rows:
+        for name, v in (r.get("phases") or {}).items():
+            phases.setdefault(name, []).append(v)
+    return {
+        "runs": len(ok),
+        "p50": percentile(ok, 0.5),
+        "p95": percentile(ok, 0.95),
+        "max": max(ok) if ok else None,
+        "phases": {name: percentile(v, 0.5) for name, v in phases.items()},
+    }
+
+
+def daily(rows):
+    days = {}
+    for r in servers_only(rows):
+        day = days.setdefault(r["at"].date().isoformat(), {"runs": 0, "ok": 0, "challenge": 0})
+        day["runs"] += 1
+        day["ok"] += r["status"] != "failed"
+        day["challenge"] += bool(r.get("challenge"))
+    return days
+
+
+def lifetime(rows):
+    added = [r["added_hours"] for r in servers_only(rows) if r.get("added_hours")]
+    return {"renewals": len(added), "total_hours": sum(added), "mean_hours": sum(added) / len(added) if added else None}
+
+
+def risk(rows, now=None):
+    """
+    每台服务器：最新已知到期时间、剩余小时数、连续失败次数和风险等级
+      高：剩余不足 24 小时且最近一次失败，或已过期
+      中：剩余不足 48 小时，或成功率低于 80%
+    """
+    now = now or panel_now()
+    servers = {}
+    for r in sorted(servers_only(rows), key=lambda r: r["at"]):
+        s = servers.setdefault(r["server"], {"expire": None, "runs": 0, "ok": 0, "streak": 0})
+        s["runs"] += 1
+        if r["status"] == "failed":
+            s["streak"] += 1
+        else:
+            s["ok"] += 1
+            s["streak"] = 0
+        expire = r["after"] or r["before"]
+        if expire:
+            s["expire"] = expire
+    report = []
+    for server, s in sorted(servers.items()):
+        remaining = (s["expire"] - now).total_seconds() / 3600 if s["expire"] else None
+        rate = s["ok"] / s["runs"]
+        if remaining is None or remaining <= 0 or (remaining < 24 and s["streak"]):
+            level = "高"
+        elif remaining < 48 or rate < 0.8:
+            level = "中"
+        else:
+            level = "低"
+        report.append({
+            "server": server, "expire": s["expire"], "remaining_hours": remaining,
+            "success_rate": rate, "failure_streak": s["streak"], "risk": level,
+        })
+    return report
+
+
+def _fmt(v, spec=".1f"):
+    return format(v, spec) if v is not None else "-"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="续期运行历史统计")
+    parser.add_argument("--days", type=int, help="只统计最近 N 天")
+    parser.add_argument("--server", help="只统计某台服务器")
+    parser.add_argument("--file", help=f"历史文件，默认 {HISTORY_FILE}")
+    args = parser.parse_args(argv)
+
+    rows = load(args.file, args.days, args.server)
+    if not rows:
+        print(f"ℹ️ 暂无运行记录（{args.file or HISTORY_FILE}）")
+        return True
+
+    lat = latency(rows)
+    print(f"⏱ 续期耗时（{lat['runs']} 次成功）：p50 {_fmt(lat['p50'])}s / p95 {_fmt(lat['p95'])}s / 最大 {_fmt(lat['max'])}s")
+    if lat["phases"]:
+        print("   阶段 p50：" + " | ".join(f"{k} {_fmt(v, '.2f')}s" for k, v in lat["phases"].items()))
+
+    print("\n📅 每日成功率")
+    for day, d in sorted(daily(rows).items()):
+        print(f"   {day}  {d['ok']}/{d['runs']}  {d['ok'] / d['runs']:.0%}  验证挑战 {d['challenge']} 次")
+
+    life = lifetime(rows)
+    print(f"\n⏳ 续期 {life['renewals']} 次，累计增加 {_fmt(life['total_hours'])} 小时，平均每次 {_fmt(life['mean_hours'])} 小时")
+
+    print("\n⚠️ 到期风险")
+    for r in risk(rows):
+        print(
+            f"   {r['server']}  到期 {r['expire'] or '未知'}  剩余 {_fmt(r['remaining_hours'])} 小时  "
+            f"成功率 {r['success_rate']:.0%}  连续失败 {r['failure_streak']}  风险 {r['risk']}"
+        )
+    return True
+
+
+if __name__ == "__main__":
+    exit(0 if main() else 1)
@@ -0,0 +1,179 @@
+"""
+Prometheus / OpenMetrics 指标导出：从运行历史（HISTORY_FILE）和 expire.txt 生成指标，
+历史文件只追加，因此计数器在多次运行之间单调递增，适合 GitHub Actions 这种一次性任务。
+  weirdhost_phase_duration_seconds{phase}              各阶段耗时直方图（launch / login / navigation / click_to_confirm ...）
+  weirdhost_renewals_total{server,outcome}             续期结果计数（success / rate_limited / challenge_failed / login_failed ...）
+  weirdhost_expiry_seconds{server}                     距离 유통기한 的秒数，可对余量告警
+  weirdhost_last_run_timestamp_seconds{server}         最近一次运行时间，可对任务停摆告警
+
+用法：
+  python -m weirdhost.metrics                              打印到标准输出
+  python -m weirdhost.metrics --textfile metrics.prom      写入文件（node_exporter textfile collector）
+  python -m weirdhost.metrics --serve 9108                 HTTP /metrics 端点，每次抓取时重新读取历史
+文本文件和默认输出使用 Prometheus 0.0.4 文本格式（textfile collector 只认这种格式）；
+端点在抓取方的 Accept 包含 application/openmetrics-text 时返回 OpenMetrics，否则同样返回 0.0.4。
+"""
+import os
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from weirdhost.common import panel_now
+from weirdhost.history import load, servers_only
+from weirdhost.scheduler import load_expiries
+
+OPENMETRICS_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PROMETHEUS_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+BUCKETS = (0.5, 1, 2, 5, 10, 20, 30, 60, 120)
+# 点击「시간추가」到确认结果的整段耗时
+CLICK_TO_CONFIRM = ("click", "challenge", "verification")
+
+FAILURE_OUTCOMES = {
+    "limited": "rate_limited",
+    "challenge": "challenge_failed",
+    "login": "login_failed",
+    "timeout": "timeout",
+    "parse": "parse_failed",
+    "overload": "overload",
+}
+
+
+def outcome(row):
+    if row["status"] == "renewed":
+        return "success"
+    if row["status"] == "limited":
+        return "rate_limited"
+    return FAILURE_OUTCOMES.get(row.get("failure"), "error")
+
+
+def _escape(v):
+    return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _num(v):
+    return f"{v:.3f}".rstrip("0").rstrip(".") if isinstance(v, float) else str(v)
+
+
+# ===================== 指标 =====================
+def histogram(rows):
+    """返回 {phase: [耗时...]}，另加 click_to_confirm"""
+    phases = {}
+    for r in rows:
+        items = r.get("phases") or {}
+        for name, v in items.items():
+            phases.setdefault(name, []).append(v)
+        confirm = [items[p] for p in CLICK_TO_CONFIRM if p in items]
+        if "click" in items:
+            phases.setdefault("click_to_confirm", []).append(sum(confirm))
+    return phases
+
+
+def _header(name, kind, help_text, openmetrics):
+    # 0.0.4 里 counter 的 TYPE 要写带 _total 的样本名；OpenMetrics 写不带后缀的指标族名，另有 UNIT 行
+    if not openmetrics:
+        name = f"{name}_total" if kind == "counter" else name
+        return [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    lines = [f"# TYPE {name} {kind}"]
+    if name.endswith("_seconds"):
+        lines.append(f"# UNIT {name} seconds")
+    return lines + [f"# HELP {name} {help_text}"]
+
+
+def render(rows, expiries, now=None, openmetrics=False):
+    now = now or panel_now()
+    lines = _header("weirdhost_phase_duration_seconds", "histogram", "续期各阶段耗时", openmetrics)
+    for phase, values in sorted(histogram(rows).items()):
+        for le in BUCKETS:
+            lines.append(f"weirdhost_phase_duration_seconds_bucket{_labels(phase=phase, le=float(le))} {sum(v <= le for v in values)}")
+        lines.append(f"weirdhost_phase_duration_seconds_bucket{_labels(phase=phase, le='+Inf')} {len(values)}")
+        lines.append(f"weirdhost_phase_duration_seconds_sum{_labels(phase=phase)} {_num(float(sum(values)))}")
+        lines.append(f"weirdhost_phase_duration_seconds_count{_labels(phase=phase)} {len(values)}")
+
+    counts, last_run = {}, {}
+    for r in servers_only(rows):
+        key = (r["server"], outcome(r))
+        counts[key] = counts.get(key, 0) + 1
+        last_run[r["server"]] = max(last_run.get(r["server"], r["at"]), r["at"])
+    lines += _header("weirdhost_renewals", "counter", "续期结果计数", openmetrics)
+    for (server, name), n in sorted(counts.items()):
+        lines.append(f"weirdhost_renewals_total{_labels(server=server, outcome=name)} {n}")
+
+    lines += _header("weirdhost_expiry_seconds", "gauge", "距离 유통기한 的秒数，负数表示已过期", openmetrics)
+    for server, expire in sorted(expiries.items()):
+        lines.append(f"weirdhost_expiry_seconds{_labels(server=server)} {_num((expire - now).total_seconds())}")
+
+    lines += _header("weirdhost_last_run_timestamp_seconds", "gauge", "最近一次续期运行的 Unix 时间", openmetrics)
+    for server, at in sorted(last_run.items()):
+        lines.append(f"weirdhost_last_run_timestamp_seconds{_labels(server=server)} {_num(at.timestamp())}")
+    if openmetrics:
+        lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+def collect(path=None, openmetrics=False):
+    rows = load(path)
+    # expire.txt 由每次续期和预检刷新，比历史里的到期时间更新
+    expiries = {}
+    for r in sorted(servers_only(rows), key=lambda r: r["at"]):
+        if r["after"] or r["before"]:
+            expiries[r["server"]] = r["after"] or r["before"]
+    expiries.update(load_expiries())
+    return render(rows, expiries, openmetrics=openmetrics)
+
+
+def write_textfile(path, history=None):
+    # 先写临时文件再改名，textfile collector 不会读到写了一半的文件
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(collect(history))
+    os.replace(tmp, path)
+    print(f"📈 指标已写入 {path}")
+
+
+def serve(port, history=None):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            openmetrics = "application/openmetrics-text" in self.headers.get("Accept", "")
+            body = collect(history, openmetrics).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", OPENMETRICS_TYPE if openmetrics else PROMETHEUS_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    httpd = ThreadingHTTPServer(("0.0.0.0", port), Handler)
+    print(f"📈 指标端点 http://0.0.0.0:{port}/metrics")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="导出续期指标（Prometheus / OpenMetrics）")
+    parser.add_argument("--textfile", help="写入指定文件")
+    parser.add_argument("--serve", type=int, metavar="PORT", help="以 HTTP /metrics 端点提供指标")
+    parser.add_argument("--history", help="历史文件，默认与 weirdhost.history 相同")
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        serve(args.serve, args.history)
+    elif args.textfile:
+        write_textfile(args.textfile, args.history)
+    else:
+        print(collect(args.history), end="")
+    return True
+
+
+if __name__ == "__main__":
+    exit(0 if main() else 1)
@@ -0,0 +1,276 @@
+"""
+本地模拟 weirdhost 面板，用于离线测试和基准测试，不会触碰真实账号。
+
+提供：
+  /auth/login                            登录表单（input[name="username"] / input[name="password"]）
+  /server/<id>                           含 유통기한 文本和「시간추가」按钮的服务器页
+  /api/client/account                    会话校验
+  /api/client/servers/<id>               服务器详情 JSON（expire_date）
+  /api/client/notfreeservers/<id>/renew  续期接口（同一周期内重复续期返回 once at one time period）
+  /cdn-cgi/challenge-platform/cloudflare 可选的假 Turnstile 验证框
+  POST /__mock/reset                     重置续期状态
+
+用法：
+  python -m weirdhost.mock_panel --port 8765 --latency 200 --challenge
+  WEIRDHOST_BASE_URL=http://127.0.0.1:8765 REMEMBER_WEB_COOKIE=mock-cookie python main.py
+"""
+import json
+import time
+import secrets
+import argparse
+import threading
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from http.cookies import SimpleCookie
+from urllib.parse import parse_qs
+
+from weirdhost.common import DEFAULT_SERVER_ID, REMEMBER_COOKIE_NAME, panel_now
+
+MOCK_COOKIE = "mock-cookie"
+MOCK_USER = "mock@example.com"
+MOCK_PASSWORD = "mock-password"
+LIMITED_MESSAGE = "You can only renew once at one time period"
+
+LOGIN_PAGE = """<!doctype html><html><body>
+<form method="post" action="/auth/login">
+  <input name="username"><input name="password" type="password">
+  <button type="submit">Login</button>
+</form></body></html>"""
+
+SERVER_PAGE = """<!doctype html><html><body>
+<img src="/static/banner.png"><link rel="stylesheet" href="/static/font.woff2">
+<div class="expire">유통기한 <span id="expire">{expire}</span></div>
+<button id="renew">시간추가</button>
+<div id="challenge"></div><div id="alert" style="color:red"></div>
+<script>
+const CHALLENGE = {challenge}, SOLVE_MS = {solve_ms};
+// 与真实面板一样，前端通过客户端 API 拉取服务器详情
+const loadDetails = () => fetch('/api/client/servers/{server_id}', {{credentials: 'same-origin'}});
+loadDetails();
+function renew(token) {{
+  const xhr = new XMLHttpRequest();
+  xhr.open('POST', '/api/client/notfreeservers/{server_id}/renew');
+  xhr.setRequestHeader('Content-Type', 'application/json');
+  xhr.onload = () => {{
+    const data = JSON.parse(xhr.responseText || '{{}}');
+    if (xhr.status === 200) {{
+      document.getElementById('expire').textContent = data.expire_date;
+      loadDetails();
+    }} else document.getElementById('alert').textContent = data.error;
+  }};
+  xhr.send(JSON.stringify({{'cf-turnstile-response': token}}));
+}}
+document.getElementById('renew').onclick = () => {{
+  if (!CHALLENGE) return renew('');
+  document.getElementById('challenge').innerHTML =
+    '<iframe src="/cdn-cgi/challenge-platform/cloudflare" width="300" height="65"></iframe>' +
+    '<input type="hidden" name="cf-turnstile-response" value="">';
+  setTimeout(() => {{
+    document.querySelector('input[name="cf-turnstile-response"]').value = 'mock-token';
+    renew('mock-token');
+  }}, SOLVE_MS);
+}};
+</script></body></html>"""
+
+CHALLENGE_PAGE = """<!doctype html><html><body>
+<div id="challenge-stage"><input type="checkbox"> Verify you are human</div></body></html>"""
+
+
+class MockPanel:
+    def __init__(self, port=0, latency=0.0, challenge=False, solve_ms=1500, limited=False, renew_hours=24, period_hours=24, outage=False):
+        self.latency = latency
+        self.challenge = challenge
+        self.solve_ms = solve_ms
+        self.limited = limited
+        self.renew_hours = renew_hours
+        self.period_hours = period_hours
+        self.outage = outage
+        self.sessions = set()
+        self.lock = threading.Lock()
+        self.servers = {}
+        self.reset()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def reset(self):
+        with self.lock:
+            self.servers.clear()
+            self.first_request = None
+
+    def touch(self):
+        """记录收到第一个请求的时间，基准测试据此计算脚本从启动到首次访问面板的耗时"""
+        with self.lock:
+            if self.first_request is None:
+                self.first_request = time.monotonic()
+
+    def server(self, server_id):
+        with self.lock:
+            if server_id not in self.servers:
+                now = panel_now().replace(microsecond=0)
+                self.servers[server_id] = {
+                    "expire": now + timedelta(days=2),
+                    "last_renew": now if self.limited else None,
+                }
+            return self.servers[server_id]
+
+    def renew(self, server_id):
+        """返回 (HTTP 状态码, JSON)"""
+        srv = self.server(server_id)
+        with self.lock:
+            now = panel_now()
+            if srv["last_renew"] and now - srv["last_renew"] < timedelta(hours=self.period_hours):
+                return 400, {"error": LIMITED_MESSAGE}
+            srv["last_renew"] = now
+            srv["expire"] += timedelta(hours=self.renew_hours)
+            return 200, {"expire_date": f"{srv['expire']:%Y-%m-%d %H:%M:%S}"}
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self.base_url
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _handler_class(self):
+        panel = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            # ---------- 工具 ----------
+            def _cookies(self):
+                jar = SimpleCookie(self.headers.get("Cookie", ""))
+                return {k: v.value for k, v in jar.items()}
+
+            def _authed(self):
+                cookies = self._cookies()
+                return cookies.get(REMEMBER_COOKIE_NAME) == MOCK_COOKIE or cookies.get("laravel_session") in panel.sessions
+
+            def _send(self, status, body=b"", content_type="text/html; charset=utf-8", headers=None):
+                if isinstance(body, str):
+                    body = body.encode()
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("Set-Cookie", f"XSRF-TOKEN={secrets.token_hex(8)}; Path=/")
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _json(self, status, data):
+                self._send(status, json.dumps(data), "application/json")
+
+            def _redirect(self, location, headers=None):
+                self._send(302, headers={"Location": location, **(headers or {})})
+
+            def _body(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                return self.rfile.read(length).decode() if length else ""
+
+            # ---------- 路由 ----------
+            def do_GET(self):
+                panel.touch()
+                time.sleep(panel.latency)
+                if panel.outage:
+                    return self._send(503, "Service Unavailable")
+                path = self.path.split("?", 1)[0]
+                parts = path.strip("/").split("/")
+
+                if path == "/auth/login":
+                    return self._send(200, LOGIN_PAGE)
+                if path.startswith("/static/"):
+                    return self._send(200, b"\0" * 20000, "application/octet-stream")
+                if path.startswith("/cdn-cgi/challenge-platform/"):
+                    return self._send(200, CHALLENGE_PAGE)
+                if parts[0] == "server" and len(parts) == 2:
+                    if not self._authed():
+                        return self._redirect("/auth/login")
+                    srv = panel.server(parts[1])
+                    return self._send(200, SERVER_PAGE.format(
+                        expire=f"{srv['expire']:%Y-%m-%d %H:%M:%S}",
+                        server_id=parts[1],
+                        challenge=json.dumps(panel.challenge),
+                        solve_ms=panel.solve_ms,
+                    ))
+                if path == "/api/client/account":
+                    if not self._authed():
+                        return self._json(401, {"errors": [{"code": "AuthenticationException"}]})
+                    return self._json(200, {"object": "user", "attributes": {"email": MOCK_USER}})
+                if parts[:3] == ["api", "client", "servers"] and len(parts) == 4:
+                    if not self._authed():
+                        return self._json(401, {"errors": [{"code": "AuthenticationException"}]})
+                    srv = panel.server(parts[3])
+                    return self._json(200, {"object": "server", "attributes": {
+                        "identifier": parts[3],
+                        "expire_date": f"{srv['expire']:%Y-%m-%d %H:%M:%S}",
+                    }})
+                self._send(404, "not found")
+
+            def do_POST(self):
+                panel.touch()
+                time.sleep(panel.latency)
+                if panel.outage:
+                    return self._send(503, "Service Unavailable")
+                path = self.path.split("?", 1)[0]
+                parts = path.strip("/").split("/")
+                body = self._body()
+
+                if path == "/__mock/reset":
+                    panel.reset()
+                    return self._json(200, {"ok": True})
+                if path == "/auth/login":
+                    form = parse_qs(body)
+                    if form.get("username") == [MOCK_USER] and form.get("password") == [MOCK_PASSWORD]:
+                        sid = secrets.token_hex(16)
+                        panel.sessions.add(sid)
+                        return self._redirect(
+                            f"/server/{DEFAULT_SERVER_ID}",
+                            {"Set-Cookie": f"laravel_session={sid}; Path=/; HttpOnly"},
+                        )
+                    return self._redirect("/auth/login")
+                if parts[:3] == ["api", "client", "notfreeservers"] and parts[-1] == "renew":
+                    if not self._authed():
+                        return self._json(401, {"errors": [{"code": "AuthenticationException"}]})
+                    token = ""
+                    try:
+                        token = json.loads(body or "{}").get("cf-turnstile-response", "")
+                    except ValueError:
+                        pass
+                    if panel.challenge and not token:
+                        return self._json(403, {"error": "cf-turnstile token required"})
+                    status, data = panel.renew(parts[3])
+                    return self._json(status, data)
+                self._send(404, "not found")
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="本地模拟 weirdhost 面板")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="每个请求的额外延迟（秒）")
+    parser.add_argument("--challenge", action="store_true", help="点击续期时弹出假 Turnstile")
+    parser.add_argument("--solve-ms", type=int, default=1500, help="假 Turnstile 自动通过所需毫秒")
+    parser.add_argument("--limited", action="store_true", help="初始即处于本周期已续期状态")
+    parser.add_argument("--outage", action="store_true", help="所有请求返回 503，模拟面板故障")
+    args = parser.parse_args()
+
+    panel = MockPanel(args.port, args.latency, args.challenge, args.solve_ms, args.limited, outage=args.outage)
+    print(f"🧪 模拟面板已启动: {panel.base_url}（Cookie: {MOCK_COOKIE}，账号: {MOCK_USER} / {MOCK_PASSWORD}）")
+    try:
+        panel.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+网络拦截层：通过 route 屏蔽图片、字体、媒体和第三方统计脚本，放行 Turnstile 需要的域名；
+导航不再等待 networkidle（控制台 websocket 导致它经常无法结束），而是等到「시간추가」按钮出现。
+
+环境变量：
+  BLOCK_RESOURCES=0          关闭拦截
+  BLOCK_RESOURCE_TYPES       拦截的资源类型，默认 image,font,media
+  BLOCK_ALLOW_DOMAINS        额外放行的域名（逗号分隔）
+"""
+import os
+from urllib.parse import urlparse
+
+READY_SELECTOR = 'button:has-text("시간추가")'
+
+DEFAULT_BLOCK_TYPES = "image,font,media"
+# Turnstile 的脚本、iframe 和校验请求都来自这些域名，必须放行
+ALLOW_DOMAINS = ("challenges.cloudflare.com", "cloudflare.com")
+TRACKER_DOMAINS = (
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googlesyndication.com",
+    "facebook.net", "hotjar.com", "clarity.ms", "cloudflareinsights.com", "sentry.io",
+)
+# 被拦截请求无法得知真实大小，按类型估算节省的流量
+ESTIMATED_BYTES = {"image": 40_000, "font": 60_000, "media": 500_000, "script": 50_000}
+
+
+def _matches(host, domains):
+    return any(host == d or host.endswith("." + d) for d in domains)
+
+
+class RequestBlocker:
+    def __init__(self, block_types=None, allow_domains=None):
+        types = block_types or os.getenv("BLOCK_RESOURCE_TYPES", DEFAULT_BLOCK_TYPES)
+        self.block_types = {t.strip() for t in types.split(",") if t.strip()}
+        extra = [d.strip() for d in os.getenv("BLOCK_ALLOW_DOMAINS", "").split(",") if d.strip()]
+        self.allow_domains = tuple(allow_domains or ALLOW_DOMAINS) + tuple(extra)
+        self.blocked = {}
+        self.loaded_requests = 0
+        self.loaded_bytes = 0
+
+    @staticmethod
+    def enabled():
+        return os.getenv("BLOCK_RESOURCES", "1") != "0"
+
+    def should_block(self, url, resource_type):
+        host = urlparse(url).hostname or ""
+        if _matches(host, self.allow_domains):
+            return False
+        if _matches(host, TRACKER_DOMAINS):
+            return True
+        # 面板自身的页面、脚本、接口一律放行
+        return resource_type in self.block_types and resource_type != "document"
+
+    def handle(self, route, request):
+        # 返回的协程由 Playwright 负责 await
+        if self.should_block(request.url, request.resource_type):
+            self.blocked[request.resource_type] = self.blocked.get(request.resource_type, 0) + 1
+            return route.abort()
+        return route.continue_()
+
+    def on_response(self, response):
+        self.loaded_requests += 1
+        self.loaded_bytes += int(response.headers.get("content-length") or 0)
+
+    def install(self, target):
+        """
+        在 page 或 context 上安装拦截，需要 await 返回值
+        """
+        target.on("response", self.on_response)
+        return target.route("**/*", self.handle)
+
+    @property
+    def saved_bytes(self):
+        return sum(ESTIMATED_BYTES.get(t, 10_000) * n for t, n in self.blocked.items())
+
+    def report(self):
+        total = sum(self.blocked.values())
+        detail = "，".join(f"{t} {n}" for t, n in sorted(self.blocked.items())) or "无"
+        return (
+            f"🚫 拦截 {total} 个请求（{detail}），约节省 {self.saved_bytes / 1024:.0f} KB；"
+            f"实际加载 {self.loaded_requests} 个请求 / {self.loaded_bytes / 1024:.0f} KB"
+        )
+
+
+# ===================== 导航就绪条件 =====================
+def _is_login(url):
+    return "login" in urlparse(url).path
+
+
+async def async_goto_ready(page, url, timeout=30000):
+    """打开页面并等到续期按钮出现；被重定向到登录页时立即返回"""
+    await page.goto(url, wait_until="domcontentloaded", timeout=timeout)
+    if not _is_login(page.url):
+        await page.wait_for_selector(READY_SELECTOR, state="visible", timeout=timeout)
@@ -0,0 +1,131 @@
+"""
+异步 Telegram 通知：消息放入队列由后台线程发送，续期流程从不等待 Telegram。
+  - 复用同一个 requests.Session（连接池）
+  - 同一会话内每条消息至少间隔 TELEGRAM_MIN_INTERVAL 秒，遇到 429 按 retry_after 等待后重试
+  - 多台服务器的结果先汇总到 digest，运行结束时合并成一条消息发送
+  - 进程退出时自动 flush
+"""
+import os
+import time
+import queue
+import atexit
+import threading
+
+MAX_MESSAGE_LEN = 4096
+MAX_RETRIES = 5
+
+
+class TelegramNotifier:
+    def __init__(self, token, chat_id, min_interval=None, timeout=10):
+        self.token = token
+        self.chat_id = chat_id
+        self.min_interval = float(min_interval if min_interval is not None else os.getenv("TELEGRAM_MIN_INTERVAL") or "1")
+        self.timeout = timeout
+        self.queue = queue.Queue()
+        self.digest = {}
+        self.digest_lock = threading.Lock()
+        self.session = None
+        self.last_sent = 0.0
+        self.worker = threading.Thread(target=self._run, name="telegram-notifier", daemon=True)
+        self.worker.start()
+
+    @property
+    def enabled(self):
+        return bool(self.token and self.chat_id)
+
+    # ---------- 对外接口（均不阻塞） ----------
+    def send(self, text):
+        if not self.enabled:
+            print("⚠️ 未配置 Telegram，跳过通知")
+            return
+        # 超过 Telegram 单条长度上限时按行切分，单行本身过长时再按长度切成多段
+        chunk = ""
+        for line in text.split("\n"):
+            if chunk and len(chunk) + len(line) + 1 > MAX_MESSAGE_LEN:
+                self.queue.put(chunk)
+                chunk = ""
+            if chunk:
+                chunk = f"{chunk}\n{line}"
+                continue
+            while len(line) > MAX_MESSAGE_LEN:
+                self.queue.put(line[:MAX_MESSAGE_LEN])
+                line = line[MAX_MESSAGE_LEN:]
+            chunk = line
+        if chunk:
+            self.queue.put(chunk)
+
+    def add_to_digest(self, key, line):
+        """同一 key 只保留最新一行，flush 时合并发送"""
+        with self.digest_lock:
+            self.digest[key] = line
+
+    def take_digest(self):
+        """取出并清空 digest（子进程把结果交给主进程统一发送时使用）"""
+        with self.digest_lock:
+            lines, self.digest = list(self.digest.values()), {}
+        return lines
+
+    def flush(self, title=None, timeout=30):
+        """发送汇总消息并等待队列清空（最多 timeout 秒）"""
+        lines = self.take_digest()
+        if lines:
+            self.send("\n".join(([title, ""] if title else []) + lines))
+        deadline = time.monotonic() + timeout
+        while self.queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.05)
+        # timeout=0 只是把消息交给后台线程（daemon 每个任务后都这样调用），不算遗留
+        if timeout and self.queue.unfinished_tasks:
+            print(f"⚠️ 仍有 {self.queue.unfinished_tasks} 条 Telegram 消息未发送")
+
+    # ---------- 后台发送 ----------
+    def _run(self):
+        while True:
+            text = self.queue.get()
+            try:
+                self._post(text)
+            except Exception as e:
+                print(f"Telegram 发送失败: {e}")
+            finally:
+                self.queue.task_done()
+
+    def _post(self, text):
+        import requests
+
+        if self.session is None:
+            self.session = requests.Session()
+        for _ in range(MAX_RETRIES):
+            wait = self.min_interval - (time.monotonic() - self.last_sent)
+            if wait > 0:
+                time.sleep(wait)
+            resp = self.session.post(
+                f"https://api.telegram.org/bot{self.token}/sendMessage",
+                json={
+                    "chat_id": self.chat_id,
+                    "text": text,
+                    "parse_mode": "HTML",
+                    "disable_web_page_preview": True,
+                },
+                timeout=self.timeout,
+            )
+            self.last_sent = time.monotonic()
+            if resp.status_code != 429:
+                if not resp.ok:
+                    print(f"Telegram 发送失败: HTTP {resp.status_code} {resp.text[:200]}")
+                return
+            retry_after = resp.json().get("parameters", {}).get("retry_after", 1)
+            print(f"⏳ Telegram 限流，{retry_after}s 后重试")
+            time.sleep(retry_after)
+        print("Telegram 发送失败: 多次限流后放弃")
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_notifier():
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = TelegramNotifier(os.getenv("TELEGRAM_BOT_TOKEN"), os.getenv("TELEGRAM_CHAT_ID"))
+            atexit.register(_default.flush)
+        return _default
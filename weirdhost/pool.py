@@ -0,0 +1,122 @@
+"""
+多账号多进程续期：读取账号清单（与 fleet 相同：SERVER_IDS / ACCOUNTS_MANIFEST / servers.json），
+按 CPU 核数把账号分片到进程池。每个进程启动自己的 Chromium，每个账号使用独立的 context（独立 Cookie），
+账号内按 concurrency 限制并发页面数；所有结果回到主进程汇总成一份报告和一条 Telegram 消息。
+
+用法：
+  python -m weirdhost.pool
+  python -m weirdhost.pool --workers 2 --preset test
+
+环境变量：
+  POOL_WORKERS               进程数，默认 min(账号数, CPU 核数)
+  POOL_ACCOUNT_CONCURRENCY   清单里未写 concurrency 的账号的默认页面并发，默认 2
+"""
+import os
+import time
+import asyncio
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+
+from weirdhost.admission import default_admission
+from weirdhost.core import PRESETS, Strategy, format_line, format_report, format_title, run
+from weirdhost.fleet import load_config
+from weirdhost.notifier import default_notifier
+from weirdhost.tracing import RunTrace
+
+DEFAULT_ACCOUNT_CONCURRENCY = int(os.getenv("POOL_ACCOUNT_CONCURRENCY") or "2")
+
+
+def shard(accounts, workers):
+    """按服务器数量从多到少轮流分配，使各进程负载接近"""
+    shards = [[] for _ in range(workers)]
+    for i, account in enumerate(sorted(accounts, key=lambda a: -len(a["servers"]))):
+        shards[i % workers].append(account)
+    return [s for s in shards if s]
+
+
+def run_shard(index, accounts, strategy, concurrency, workers=1):
+    """在子进程中运行：一个浏览器，分片内各账号并发，各自独立 context"""
+    # 面板限速是全局的，各进程平分
+    default_admission().share(workers)
+    trace = RunTrace(f"pool-{index}")
+    start = time.monotonic()
+    results = asyncio.run(run(accounts, Strategy(**strategy), concurrency, trace))
+    # 汇总消息由主进程统一发送，子进程退出时不要再发
+    default_notifier().take_digest()
+    return {
+        "shard": index,
+        "accounts": [a["name"] for a in accounts],
+        "seconds": round(time.monotonic() - start, 2),
+        "phases": {k: round(v, 3) for k, v in trace.durations.items()},
+        "admission": trace.fields.get("admission"),
+        "results": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="多账号多进程续期")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("POOL_WORKERS", "0") or 0))
+    parser.add_argument("--preset", choices=sorted(PRESETS), help="续期策略预设，默认与 fleet 相同")
+    args = parser.parse_args(argv)
+
+    config = load_config()
+    accounts = config["accounts"]
+    for account in accounts:
+        account.setdefault("concurrency", DEFAULT_ACCOUNT_CONCURRENCY)
+    strategy = PRESETS[args.preset] if args.preset else Strategy()
+    trace = RunTrace("pool")
+    if not accounts:
+        # FLEET_ONLY_DUE 过滤后没有到期的服务器，或清单里的账号都没有服务器
+        print("🛑 没有需要续期的服务器，不启动进程池")
+        trace.set(outcome="skipped", workers=0, strategy=asdict(strategy), results=[])
+        trace.write()
+        return True
+    workers = min(len(accounts), args.workers or os.cpu_count() or 1) or 1
+    shards = shard(accounts, workers)
+    total = sum(len(a["servers"]) for a in accounts)
+    print(f"🚀 开始多进程续期：{len(accounts)} 个账号，{total} 台服务器，{len(shards)} 个进程")
+
+    trace.set(workers=len(shards), strategy=asdict(strategy))
+    start = time.monotonic()
+    with trace.span("workers"):
+        # playwright 驱动和通知线程都不适合 fork，统一用 spawn
+        with ProcessPoolExecutor(len(shards), mp_context=multiprocessing.get_context("spawn")) as executor:
+            futures = [
+                executor.submit(run_shard, i, s, asdict(strategy), config["concurrency"], len(shards))
+                for i, s in enumerate(shards)
+            ]
+            shard_reports = []
+            for future, accounts_in_shard in zip(futures, shards):
+                try:
+                    shard_reports.append(future.result())
+                except Exception as e:
+                    # 整个子进程崩溃时，该分片的服务器全部记为失败
+                    shard_reports.append({"results": [
+                        {"server": sid, "before": None, "after": None, "status": "failed",
+                         "error": f"进程异常: {str(e).splitlines()[0] if str(e) else type(e).__name__}", "failure": "unknown", "seconds": 0}
+                        for a in accounts_in_shard for sid in a["servers"]
+                    ]})
+    results = [r for report in shard_reports for r in report["results"]]
+    elapsed = time.monotonic() - start
+
+    print(format_report(results, elapsed, "多进程续期"))
+    notifier = default_notifier()
+    for r in results:
+        notifier.add_to_digest(r["server"], format_line(r))
+    with trace.span("telegram"):
+        notifier.flush(format_title(results, elapsed, "多进程续期"))
+
+    ok = all(r["status"] != "failed" for r in results)
+    trace.set(
+        outcome="renewed" if ok else "failed",
+        shards=[{k: v for k, v in report.items() if k != "results"} for report in shard_reports],
+        results=results,
+    )
+    trace.write()
+    return ok
+
+
+if __name__ == "__main__":
+    exit(0 if main() else 1)
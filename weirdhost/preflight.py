@@ -0,0 +1,107 @@
+"""
+浏览器前的 HTTP 预检：每台服务器只请求一次服务器详情接口，同时确认面板可达、会话有效和当前 유통기한，
+据此决定本次是否值得启动 Chromium：
+  skip   面板正常、会话有效，续期窗口还没打开（本周期已续过）      不启动浏览器
+  defer  面板不可达、超时、429 或 5xx，浏览器也不可能成功           留给下一次运行
+  run    窗口已打开、会话失效、遇到验证挑战或读不到到期时间         完整浏览器续期
+每次决策追加到 PREFLIGHT_FILE（默认 .history/preflight.jsonl，与运行历史一起由 actions/cache 保留）。
+
+用法：
+  python -m weirdhost.preflight [服务器ID ...]   只预检并打印决策
+
+环境变量：
+  PREFLIGHT           设为 0 时跳过预检，总是启动浏览器
+  PREFLIGHT_TIMEOUT   单次请求超时（秒），默认 8
+  RENEW_WINDOW_HOURS  与 scheduler 相同，到期前多少小时开始允许续期
+"""
+import os
+import sys
+import json
+import time
+from datetime import datetime
+import requests
+
+from weirdhost.common import DEFAULT_SERVER_ID, panel_now
+from weirdhost.fastpath import ChallengeRequired, build_session, get_expire
+from weirdhost.history import HISTORY_FILE
+from weirdhost.scheduler import record_expiry, window_start
+from weirdhost.session_store import SessionStore, credential_secret
+
+ENABLED = os.getenv("PREFLIGHT", "1") != "0"
+TIMEOUT = float(os.getenv("PREFLIGHT_TIMEOUT") or "8")
+PREFLIGHT_FILE = os.getenv("PREFLIGHT_FILE", os.path.join(os.path.dirname(HISTORY_FILE) or ".", "preflight.jsonl"))
+
+DECISION_ICON = {"skip": "💤", "defer": "⏸", "run": "🚀"}
+
+
+def probe(session, server_id, now=None, timeout=TIMEOUT):
+    """返回 {"server", "decision", "reason", "http", "expire", "seconds"}"""
+    now = now or panel_now()
+    start = time.monotonic()
+    check = {"server": server_id, "decision": "run", "reason": None, "http": None, "expire": None}
+    try:
+        check["expire"] = get_expire(session, server_id, timeout)
+        check["http"] = 200
+    except ChallengeRequired as e:
+        check["reason"] = str(e)
+    except requests.HTTPError as e:
+        check["http"] = e.response.status_code
+        if e.response.status_code == 429 or e.response.status_code >= 500:
+            check["decision"], check["reason"] = "defer", f"面板返回 HTTP {e.response.status_code}"
+        else:
+            check["reason"] = f"服务器详情接口返回 HTTP {e.response.status_code}"
+    except requests.RequestException as e:
+        check["decision"], check["reason"] = "defer", f"面板不可达: {str(e).splitlines()[0]}"
+    else:
+        if check["expire"] is None:
+            check["reason"] = "接口中没有到期时间"
+        elif now < window_start(check["expire"]):
+            check["decision"] = "skip"
+            check["reason"] = f"续期窗口 {window_start(check['expire']):%Y-%m-%d %H:%M} 才打开"
+        else:
+            check["reason"] = "续期窗口已打开"
+    check["seconds"] = round(time.monotonic() - start, 3)
+    return check
+
+
+def preflight(account, run="preflight"):
+    """预检账号下的每台服务器，记录并返回决策列表"""
+    store = SessionStore(
+        account["name"],
+        credential_secret(account.get("remember_cookie"), account.get("email"), account.get("password")),
+    )
+    session = build_session(account.get("remember_cookie"), store.load())
+    checks = []
+    for server_id in account["servers"]:
+        check = probe(session, server_id)
+        # 顺便刷新 expire.txt，scheduler 下次判断窗口时用得上
+        record_expiry(server_id, check["expire"])
+        print(f"{DECISION_ICON[check['decision']]} 预检 {server_id}: {check['decision']}（{check['reason']}，{check['seconds']:.2f}s）")
+        checks.append(check)
+    record(run, account["name"], checks)
+    return checks
+
+
+def record(run, account, checks, path=None):
+    path = path or PREFLIGHT_FILE
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    at = datetime.now().isoformat(timespec="seconds")
+    with open(path, "a", encoding="utf-8") as f:
+        for check in checks:
+            f.write(json.dumps({"at": at, "run": run, "account": account, **check}, ensure_ascii=False, default=str) + "\n")
+
+
+def main(argv):
+    account = {
+        "name": "default",
+        "servers": argv or [DEFAULT_SERVER_ID],
+        "remember_cookie": os.getenv("REMEMBER_WEB_COOKIE"),
+        "email": os.getenv("PTERODACTYL_EMAIL"),
+        "password": os.getenv("PTERODACTYL_PASSWORD"),
+    }
+    preflight(account)
+    return True
+
+
+if __name__ == "__main__":
+    exit(0 if main(sys.argv[1:]) else 1)
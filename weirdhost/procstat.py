@@ -0,0 +1,36 @@
+"""进程树内存统计（读取 /proc，仅 Linux）"""
+import os
+
+
+def _children_map():
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # 进程名可能含空格，从最后一个 ')' 之后解析
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    return children
+
+
+def tree_rss(pid):
+    """进程及其所有子进程（含 Chromium）的 RSS 之和，单位字节；非 Linux 返回 None"""
+    if not os.path.isdir("/proc"):
+        return None
+    children = _children_map()
+    total, stack = 0, [pid]
+    while stack:
+        p = stack.pop()
+        stack.extend(children.get(p, []))
+        try:
+            with open(f"/proc/{p}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+        except OSError:
+            pass
+    return total
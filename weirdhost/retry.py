@@ -0,0 +1,119 @@
+"""
+分阶段重试：失败按类型分类，只重试失败的阶段，复用当前 page / context，不重新启动浏览器。
+
+失败类型：
+  timeout    网络超时 / 元素迟迟不出现          可重试
+  login      被重定向到登录页                    重新登录后重试
+  challenge  Turnstile 未通过                    可重试
+  parse      读不到到期时间 / 结果无法确认        可重试
+  limited    本周期已续期（频率限制提示）        不重试
+  overload   面板熔断中，等待超出预算          不重试（见 admission.py）
+  unknown    其他异常                            不重试
+
+退避：base * 2^n，乘以 0.5~1.5 的随机抖动，单次不超过 RETRY_MAX_DELAY；
+同一台服务器所有阶段共享 RETRY_BUDGET 秒的总预算，预算不足以等待下一次时直接放弃。
+
+环境变量：
+  RETRY_ATTEMPTS      每个阶段最多尝试次数，默认 3
+  RETRY_BUDGET        每台服务器重试总预算（秒），默认 90
+  RETRY_BASE_DELAY    初始退避（秒），默认 1
+  RETRY_MAX_DELAY     单次退避上限（秒），默认 15
+"""
+import os
+import time
+import random
+import asyncio
+
+
+# ===================== 失败分类 =====================
+class RenewFailure(Exception):
+    kind = "unknown"
+    retryable = False
+    phase = None
+
+
+class NetworkTimeout(RenewFailure):
+    kind = "timeout"
+    retryable = True
+
+
+class LoginRedirect(RenewFailure):
+    kind = "login"
+    retryable = True
+
+
+class ChallengeFailed(RenewFailure):
+    kind = "challenge"
+    retryable = True
+
+
+class ParseFailure(RenewFailure):
+    kind = "parse"
+    retryable = True
+
+
+class RateLimited(RenewFailure):
+    kind = "limited"
+
+
+class PanelOverloaded(RenewFailure):
+    kind = "overload"
+
+
+def classify(exc):
+    if isinstance(exc, RenewFailure):
+        return exc
+    # 按类型名识别 playwright 的 TimeoutError，分类时不必导入 playwright
+    if isinstance(exc, asyncio.TimeoutError) or type(exc).__name__ == "TimeoutError" or "net::ERR_" in str(exc):
+        failure = NetworkTimeout(str(exc).split("\n", 1)[0])
+    else:
+        failure = RenewFailure(str(exc))
+    failure.__cause__ = exc
+    return failure
+
+
+# ===================== 重试预算 =====================
+class RetryBudget:
+    def __init__(self, label=None, budget=None, attempts=None, gate=None):
+        self.gate = gate
+        self.prefix = f"[{label}] " if label else ""
+        self.budget = float(budget if budget is not None else os.getenv("RETRY_BUDGET") or "90")
+        self.attempts = int(attempts if attempts is not None else os.getenv("RETRY_ATTEMPTS") or "3")
+        self.base = float(os.getenv("RETRY_BASE_DELAY") or "1")
+        self.cap = float(os.getenv("RETRY_MAX_DELAY") or "15")
+        self.deadline = time.monotonic() + self.budget
+        self.history = []
+
+    def remaining(self):
+        return self.deadline - time.monotonic()
+
+    def delay(self, attempt):
+        return min(self.cap, self.base * 2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+
+    async def run(self, phase, fn, recover=None):
+        """
+        执行 fn()，失败时按分类决定是否退避后重试；
+        recover(failure) 在重试前调用，用于重新登录或刷新当前页面；
+        设置了 gate（admission.Admission）时每次尝试前先取得准入，失败结果反馈给熔断器
+        """
+        for attempt in range(1, self.attempts + 1):
+            try:
+                if self.gate:
+                    await self.gate.admit(self.deadline)
+                return await fn()
+            except Exception as e:
+                failure = classify(e)
+                failure.phase = phase
+                if self.gate:
+                    self.gate.observe(failure)
+                delay = self.delay(attempt)
+                if not failure.retryable or attempt == self.attempts or delay >= self.remaining():
+                    raise failure
+                self.history.append({"phase": phase, "kind": failure.kind, "attempt": attempt, "delay": round(delay, 2)})
+                print(f"🔁 {self.prefix}{phase} 失败（{failure.kind}: {failure}），{delay:.1f}s 后第 {attempt} 次重试")
+                await asyncio.sleep(delay)
+                if recover:
+                    try:
+                        await recover(failure)
+                    except Exception as err:
+                        print(f"⚠️ {self.prefix}{phase} 恢复失败: {err}")
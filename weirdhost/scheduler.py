@@ -0,0 +1,158 @@
+"""
+按到期时间调度续期：记录每次解析到的 유통기한（expire.txt，工作流通过 actions/cache 在运行间保留），
+据此计算最早可续期时间窗口。窗口未到时直接退出或短暂休眠，窗口内才执行续期，
+临近到期仍失败时带随机抖动重试。
+
+用法：
+  python -m weirdhost.scheduler check   只判断是否需要运行（写入 GITHUB_OUTPUT: run=true/false）
+  python -m weirdhost.scheduler         判断 + 等待 + 续期 + 重试
+
+环境变量：
+  RENEW_WINDOW_HOURS          到期前多少小时开始允许续期，默认 24
+  SCHEDULER_MAX_SLEEP         窗口在多少秒内打开时原地等待，默认 1800
+  RETRY_NEAR_DEADLINE_HOURS   剩余时间少于多少小时时失败重试，默认 12
+  SCHEDULER_MAX_RETRIES       最大重试次数，默认 3
+"""
+import os
+import sys
+import time
+import random
+from contextlib import contextmanager
+from datetime import timedelta
+
+try:
+    import fcntl
+except ImportError:
+    # Windows 没有 fcntl，单进程运行时不需要锁
+    fcntl = None
+
+from weirdhost.common import DEFAULT_SERVER_ID, panel_now, parse_expire
+
+EXPIRE_FILE = os.getenv("EXPIRE_FILE", "expire.txt")
+WINDOW_HOURS = float(os.getenv("RENEW_WINDOW_HOURS") or "24")
+MAX_SLEEP = float(os.getenv("SCHEDULER_MAX_SLEEP") or "1800")
+RETRY_HOURS = float(os.getenv("RETRY_NEAR_DEADLINE_HOURS") or "12")
+MAX_RETRIES = int(os.getenv("SCHEDULER_MAX_RETRIES") or "3")
+
+
+# ===================== 到期时间记录 =====================
+def load_expiries():
+    """读取 expire.txt，每行：<服务器ID> <YYYY-MM-DD HH:MM:SS>"""
+    expiries = {}
+    if not os.path.exists(EXPIRE_FILE):
+        return expiries
+    with open(EXPIRE_FILE, encoding="utf-8") as f:
+        for line in f:
+            server_id, _, rest = line.strip().partition(" ")
+            expire = parse_expire(rest)
+            if server_id and expire:
+                expiries[server_id] = expire
+    return expiries
+
+
+@contextmanager
+def _locked(path):
+    """跨进程文件锁：pool 的多个 worker 会同时更新 expire.txt"""
+    with open(f"{path}.lock", "a") as lock:
+        if fcntl:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def record_expiry(server_id, expire):
+    if not expire:
+        return
+    with _locked(EXPIRE_FILE):
+        expiries = load_expiries()
+        expiries[server_id] = expire
+        # 先写临时文件再替换，读取方不会看到写了一半的文件
+        tmp = f"{EXPIRE_FILE}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for sid, dt in sorted(expiries.items()):
+                f.write(f"{sid} {dt:%Y-%m-%d %H:%M:%S}\n")
+        os.replace(tmp, EXPIRE_FILE)
+
+
+# ===================== 调度决策 =====================
+def window_start(expire):
+    return expire - timedelta(hours=WINDOW_HOURS)
+
+
+def decide(server_id, now=None):
+    """
+    返回 (action, seconds, opens_at)：
+      run   窗口已打开或没有记录，立即续期
+      sleep 窗口将在 MAX_SLEEP 秒内打开，等待 seconds 秒后续期
+      skip  窗口尚远，本次不运行
+    """
+    now = now or panel_now()
+    expire = load_expiries().get(server_id)
+    if expire is None:
+        return "run", 0, None
+    opens_at = window_start(expire)
+    wait = (opens_at - now).total_seconds()
+    if wait <= 0:
+        return "run", 0, opens_at
+    if wait <= MAX_SLEEP:
+        return "sleep", wait, opens_at
+    return "skip", wait, opens_at
+
+
+def due_servers(server_ids, now=None):
+    """批量续期时过滤掉窗口未打开的服务器"""
+    return [sid for sid in server_ids if decide(sid, now)[0] != "skip"]
+
+
+def _jitter(seconds):
+    return seconds * random.uniform(0.8, 1.2)
+
+
+def _write_output(**outputs):
+    path = os.getenv("GITHUB_OUTPUT")
+    if path:
+        with open(path, "a", encoding="utf-8") as f:
+            for k, v in outputs.items():
+                f.write(f"{k}={v}\n")
+
+
+def run_renewal():
+    # 延迟导入，check 命令不需要安装 playwright/requests
+    from weirdhost.fastpath import main as renew_main
+    return renew_main()
+
+
+def main(argv):
+    server_id = DEFAULT_SERVER_ID
+    action, seconds, opens_at = decide(server_id)
+    print(f"📅 {server_id} 可续期窗口: {opens_at or '未知'}，决策: {action}")
+
+    if argv[:1] == ["check"]:
+        _write_output(run=str(action != "skip").lower())
+        return True
+    if action == "skip":
+        print(f"💤 距离窗口打开还有 {seconds / 3600:.1f} 小时，本次跳过")
+        return True
+    if action == "sleep":
+        delay = seconds + random.uniform(0, 60)
+        print(f"⏳ 窗口即将打开，等待 {delay:.0f}s")
+        time.sleep(delay)
+
+    for attempt in range(MAX_RETRIES + 1):
+        if run_renewal():
+            return True
+        expire = load_expiries().get(server_id)
+        remaining = (expire - panel_now()).total_seconds() / 3600 if expire else 0
+        if attempt == MAX_RETRIES or remaining > RETRY_HOURS:
+            break
+        delay = _jitter(60 * 2 ** attempt)
+        print(f"🔁 距到期仅剩 {remaining:.1f} 小时，{delay:.0f}s 后第 {attempt + 1} 次重试")
+        time.sleep(delay)
+    return False
+
+
+if __name__ == "__main__":
+    exit(0 if main(sys.argv[1:]) else 1)
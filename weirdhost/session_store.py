@@ -0,0 +1,108 @@
+"""
+登录会话缓存：把 Playwright 的 storage_state（Cookie + localStorage）加密保存到本地，
+下次运行先用一次轻量 API 请求校验，仍有效就直接复用，跳过 Cookie 注入/账号密码登录。
+
+加密密钥优先取 SESSION_STORE_KEY，未设置时由该账号的登录凭据派生；
+两者都没有或未安装 cryptography 时缓存自动禁用。
+"""
+import os
+import json
+import base64
+import hashlib
+import time
+
+from weirdhost.common import BASE_URL, USER_AGENT
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+except ImportError:
+    Fernet = None
+
+SESSION_DIR = os.getenv("SESSION_STORE_DIR", ".session")
+VALIDATE_URL = f"{BASE_URL}/api/client/account"
+
+
+class SessionStore:
+    def __init__(self, name="default", secret=None):
+        self.path = os.path.join(SESSION_DIR, f"{name}.bin")
+        secret = os.getenv("SESSION_STORE_KEY") or secret
+        self.fernet = None
+        if Fernet is None:
+            print("⚠️ 未安装 cryptography，会话缓存已禁用")
+        elif secret:
+            key = base64.urlsafe_b64encode(hashlib.sha256(secret.encode()).digest())
+            self.fernet = Fernet(key)
+
+    @property
+    def enabled(self):
+        return self.fernet is not None
+
+    def load(self):
+        """读取并解密 storage_state，文件不存在或无法解密返回 None"""
+        if not self.enabled or not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, "rb") as f:
+                return json.loads(self.fernet.decrypt(f.read()))
+        except (InvalidToken, ValueError):
+            print("⚠️ 会话缓存无法解密，已丢弃")
+            self.clear()
+            return None
+
+    def save(self, state):
+        if not self.enabled:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(self.fernet.encrypt(json.dumps(state).encode()))
+        os.replace(tmp, self.path)
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def load_valid(self):
+        """返回仍然有效的 storage_state，否则清除缓存并返回 None"""
+        state = self.load()
+        if state is None:
+            return None
+        if validate_state(state):
+            print("♻️ 复用已缓存的登录会话")
+            return state
+        print("⌛ 缓存会话已过期，回退到 Cookie/密码登录")
+        self.clear()
+        return None
+
+
+def credential_secret(remember_cookie=None, email=None, password=None):
+    if remember_cookie:
+        return remember_cookie
+    if email and password:
+        return f"{email}:{password}"
+    return None
+
+
+def validate_state(state, timeout=10):
+    """只发一次 GET 请求校验会话，不打开页面"""
+    now = time.time()
+    cookies = {
+        c["name"]: c["value"]
+        for c in state.get("cookies", [])
+        if c.get("expires", -1) < 0 or c["expires"] > now
+    }
+    if not cookies:
+        return False
+    import requests
+    try:
+        resp = requests.get(
+            VALIDATE_URL,
+            cookies=cookies,
+            headers={"Accept": "application/json", "User-Agent": USER_AGENT},
+            allow_redirects=False,
+            timeout=timeout,
+        )
+    except requests.RequestException as e:
+        print(f"会话校验请求失败: {e}")
+        return False
+    return resp.status_code == 200
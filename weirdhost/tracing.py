@@ -0,0 +1,94 @@
+"""
+运行追踪：为续期流程的每个阶段记录命名 span，运行结束写出机器可读的 JSON 报告；
+设置 PLAYWRIGHT_TRACE=1 时额外保存 Playwright trace.zip（可用 `playwright show-trace` 查看）。
+
+报告目录由 RUN_REPORT_DIR 指定，默认 reports/。
+"""
+import os
+import json
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+REPORT_DIR = os.getenv("RUN_REPORT_DIR", "reports")
+
+
+class PhaseTimer:
+    def __init__(self, label=None):
+        self.durations = {}
+        self.prefix = f"[{label}] " if label else ""
+
+    @contextmanager
+    def phase(self, name):
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - start
+            self.durations[name] = self.durations.get(name, 0) + elapsed
+            print(f"⏱ {self.prefix}{name}: {elapsed:.2f}s")
+
+    def summary(self):
+        total = sum(self.durations.values())
+        parts = " | ".join(f"{k} {v:.1f}s" for k, v in self.durations.items())
+        return f"总耗时 {total:.1f}s（{parts}）"
+
+
+class RunTrace(PhaseTimer):
+    def __init__(self, name):
+        super().__init__()
+        self.name = name
+        self.started_at = datetime.now()
+        self.stamp = self.started_at.strftime("%Y%m%d-%H%M%S")
+        self._t0 = time.monotonic()
+        self.spans = []
+        self.fields = {"outcome": None}
+        self.browser_trace_path = (
+            os.path.join(REPORT_DIR, f"{name}-{self.stamp}-trace.zip")
+            if os.getenv("PLAYWRIGHT_TRACE") == "1" else None
+        )
+
+    @contextmanager
+    def phase(self, name):
+        start = time.monotonic()
+        error = None
+        try:
+            yield
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            elapsed = time.monotonic() - start
+            self.durations[name] = self.durations.get(name, 0) + elapsed
+            self.spans.append({
+                "name": name,
+                "start": round(start - self._t0, 3),
+                "duration": round(elapsed, 3),
+                "error": error,
+            })
+            print(f"⏱ {name}: {elapsed:.2f}s")
+
+    span = phase
+
+    def set(self, **fields):
+        self.fields.update(fields)
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "total_seconds": round(time.monotonic() - self._t0, 3),
+            "phases": {k: round(v, 3) for k, v in self.durations.items()},
+            "spans": self.spans,
+            "browser_trace": self.browser_trace_path,
+            **self.fields,
+        }
+
+    def write(self):
+        os.makedirs(REPORT_DIR, exist_ok=True)
+        path = os.path.join(REPORT_DIR, f"{self.name}-{self.stamp}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            # datetime 等对象统一转为字符串
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2, default=str)
+        print(f"📝 运行报告已写入 {path}")
+        return path
@@ -0,0 +1,124 @@
+"""
+事件驱动的等待：点击「시간추가」后不再固定 sleep，而是等待具体信号之一出现：
+  - 유통기한 文本变化（续期成功）
+  - 页面出现 "once at one time period" / "이미 연장" 提示（本周期已续过）
+  - 续期接口（XHR/fetch）返回错误或成功
+  - Cloudflare Turnstile 验证框出现 / 拿到 token
+每种等待都有截止时间，结果一确定立即返回。
+"""
+import os
+import json
+
+from weirdhost.common import parse_expire
+
+RENEW_API_PATTERN = os.getenv("RENEW_API_PATTERN", r"/api/client/.+/renew")
+
+CHALLENGE_SELECTOR = 'iframe[src*="cloudflare"]'
+
+# 记录续期接口响应，需在页面加载前通过 add_init_script 注入
+RESPONSE_HOOK_SCRIPT = """
+(() => {
+    if (window.__renewResponses) return;
+    window.__renewResponses = [];
+    const re = new RegExp(%s);
+    const record = (url, status, body) => {
+        if (re.test(url)) window.__renewResponses.push({url, status, body: String(body || '').slice(0, 500), at: Date.now()});
+    };
+    const open = XMLHttpRequest.prototype.open;
+    XMLHttpRequest.prototype.open = function (method, url) {
+        this.__url = String(url);
+        return open.apply(this, arguments);
+    };
+    const send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        this.addEventListener('loadend', () => {
+            const text = (this.responseType === '' || this.responseType === 'text') ? this.responseText : '';
+            record(this.__url, this.status, text);
+        });
+        return send.apply(this, arguments);
+    };
+    if (window.fetch) {
+        const origFetch = window.fetch;
+        window.fetch = async function (input, init) {
+            const resp = await origFetch.apply(this, arguments);
+            const url = typeof input === 'string' ? input : input.url;
+            if (re.test(url)) resp.clone().text().then(t => record(url, resp.status, t)).catch(() => {});
+            return resp;
+        };
+    }
+})();
+""" % json.dumps(RENEW_API_PATTERN)
+
+# 返回 false 表示继续等待，否则返回结果对象
+OUTCOME_SCRIPT = """
+({before, stopOnChallenge}) => {
+    const text = document.body ? document.body.innerText : '';
+    const m = text.match(/유통기한[^0-9]{0,40}(\\d{4}-\\d{2}-\\d{2} \\d{2}:\\d{2}:\\d{2})/);
+    if (m && before && m[1] > before) return {status: 'renewed', expire: m[1]};
+    if (/once at one time period|이미 연장/i.test(text)) return {status: 'limited'};
+
+    const responses = window.__renewResponses || [];
+    const last = responses[responses.length - 1];
+    if (last && last.status >= 400) {
+        const limited = /once at one time period|이미 연장/i.test(last.body);
+        return {status: limited ? 'limited' : 'rejected', http_status: last.status, body: last.body};
+    }
+    // 接口已成功但页面未刷新文本，稍等片刻后交给调用方刷新确认
+    if (last && Date.now() - last.at > 1500) return {status: 'accepted', http_status: last.status};
+
+    if (stopOnChallenge) {
+        const frame = document.querySelector('%s');
+        const token = document.querySelector('input[name="cf-turnstile-response"]');
+        if (frame && !(token && token.value)) return {status: 'challenge'};
+    }
+    return false;
+}
+""" % CHALLENGE_SELECTOR
+
+CHALLENGE_SOLVED_SCRIPT = """
+() => {
+    const token = document.querySelector('input[name="cf-turnstile-response"]');
+    if (token && token.value) return 'solved';
+    if (!document.querySelector('%s')) return 'gone';
+    return false;
+}
+""" % CHALLENGE_SELECTOR
+
+
+def _outcome_arg(before, stop_on_challenge):
+    return {
+        "before": before.strftime("%Y-%m-%d %H:%M:%S") if before else None,
+        "stopOnChallenge": stop_on_challenge,
+    }
+
+
+def _finish(outcome):
+    if outcome.get("expire"):
+        outcome["expire"] = parse_expire(outcome["expire"])
+    return outcome
+
+
+# ===================== 等待 =====================
+async def async_wait_for_outcome(page, before, timeout=30000, stop_on_challenge=False):
+    """
+    等待续期结果，返回 dict：status 为 renewed / limited / rejected / accepted / challenge / timeout
+    """
+    # playwright 在用到时才导入，`python -m weirdhost.challenge` 等统计命令不必加载它
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+    try:
+        handle = await page.wait_for_function(
+            OUTCOME_SCRIPT, arg=_outcome_arg(before, stop_on_challenge), timeout=timeout, polling=250
+        )
+    except PlaywrightTimeoutError:
+        return {"status": "timeout"}
+    return _finish(await handle.json_value())
+
+
+async def async_wait_for_challenge_solved(page, timeout=30000):
+    """等待 Turnstile 拿到 token 或验证框消失，超时返回 None"""
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+    try:
+        handle = await page.wait_for_function(CHALLENGE_SOLVED_SCRIPT, timeout=timeout, polling=250)
+    except PlaywrightTimeoutError:
+        return None
+    return await handle.json_value()